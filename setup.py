@@ -177,7 +177,8 @@ moduleLibRelation = Extension('netzob._libRelation',
                               libraries=["dl"])
 
 # Cython extensions
-cythonModules = cythonize(["src/netzob/Fuzzing/Generators/xorshift.pyx"],
+cythonModules = cythonize(["src/netzob/Fuzzing/Generators/xorshift.pyx",
+                           "src/netzob/Model/Vocabulary/Domain/Variables/Leafs/Checksums/crc16.pyx"],
                           compiler_directives={'language_level': "3"})
 
 
@@ -186,7 +187,6 @@ cythonModules = cythonize(["src/netzob/Fuzzing/Generators/xorshift.pyx"],
 # +----------------------------------------------------------------------------
 def get_dependencies():
     return """
-    getmac==0.8.3
     bintrees==2.2.0
     bitarray==0.8.1
     colorama==0.4.6
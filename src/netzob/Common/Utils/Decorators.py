@@ -36,6 +36,7 @@
 #+---------------------------------------------------------------------------+
 import logging
 import os
+import time
 
 #+---------------------------------------------------------------------------+
 #| Related third party imports                                               |
@@ -163,22 +164,25 @@ def typeCheck(*types):
 
     .. note:: set type = "SELF" to check the type of the self parameter
     .. note:: type checking can be bypassed by setting :val:`NETZOB_NO_TYPECHECK`
-              as environment variable
+              as environment variable, and is also bypassed when Python runs
+              with optimizations enabled (``python -O``)
     .. warning:: if argument is None, the type checking is not executed on it.
 
     """
 
+    # "SELF" can only be resolved at call time
+    hasSelfType = "SELF" in types
+
     def _typeCheck_(func):
         def wrapped_f(*args, **kwargs):
             arguments = args[1:]
             if len(arguments) == len(types):
                 # Replace "SELF" with args[0] type
-                final_types = []
-                for type in types:
-                    if type == "SELF":
-                        final_types.append(args[0].__class__)
-                    else:
-                        final_types.append(type)
+                if hasSelfType:
+                    final_types = [args[0].__class__ if type == "SELF" else type
+                                   for type in types]
+                else:
+                    final_types = types
 
                 for i, argument in enumerate(arguments):
                     if argument is not None and not isinstance(argument,
@@ -189,12 +193,67 @@ def typeCheck(*types):
                                               ]), argument.__class__.__name__))
             return func(*args, **kwargs)
 
-        if 'NETZOB_NO_TYPECHECK' in os.environ:
+        if not __debug__ or 'NETZOB_NO_TYPECHECK' in os.environ:
             return func
         return wraps(func)(wrapped_f)
 
     return _typeCheck_
 
 
+def ttlCache(ttl, generation=None):
+    """Decorator which memoizes the results of a function according to its
+    (hashable) positional arguments, for `ttl` seconds.
+
+    If `generation` is given, it is called on each call of the decorated
+    function, and the results memoized while it returned another value are
+    discarded.
+
+    Exceptions are not cached. The cache of the decorated function can be
+    emptied with its :func:`cache_clear` attribute.
+
+    >>> from netzob.Common.Utils.Decorators import ttlCache
+    >>> calls = []
+    >>> @ttlCache(60)
+    ... def double(x):
+    ...     calls.append(x)
+    ...     return 2 * x
+    >>> double(2), double(2), calls
+    (4, 4, [2])
+    >>> double.cache_clear()
+    >>> double(2), calls
+    (4, [2, 2])
+
+    >>> epoch = [0]
+    >>> @ttlCache(60, generation=lambda: epoch[0])
+    ... def triple(x):
+    ...     calls.append(x)
+    ...     return 3 * x
+    >>> triple(1), triple(1), calls
+    (3, 3, [2, 2, 1])
+    >>> epoch[0] += 1
+    >>> triple(1), calls
+    (3, [2, 2, 1, 1])
+
+    """
+
+    def _ttlCache_(func):
+        cache = {}
+
+        def wrapped_f(*args):
+            now = time.monotonic()
+            current = None if generation is None else generation()
+            entry = cache.get(args)
+            if entry is not None and now < entry[0] and entry[2] == current:
+                return entry[1]
+            value = func(*args)
+            cache[args] = (now + ttl, value, current)
+            return value
+
+        wrapped_f.cache_clear = cache.clear
+        return wraps(func)(wrapped_f)
+
+    return _ttlCache_
+
+
 def public_api(func):
     return func
@@ -94,6 +94,20 @@ class TypedList(collections.abc.MutableSequence):
         self.check(v)
         self.list.insert(i, v)
 
+    def extend(self, values):
+        values = list(values)
+        for v in values:
+            self.check(v)
+        self.list.extend(values)
+
+    def _unsafeExtend(self, values):
+        """Extends the list without checking the members type. The caller
+        must have validated the values beforehand."""
+        self.list.extend(values)
+
+    def clear(self):
+        del self.list[:]
+
     def __str__(self):
         return str(',\n'.join([str(x) for x in self.list]))
 
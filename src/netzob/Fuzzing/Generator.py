@@ -51,6 +51,8 @@ class Generator(collections.abc.Iterator):
     """Generates values. Abstract class.
     """
 
+    __slots__ = ('_seed', '__it')
+
     def __init__(self, seed=10):
         self.seed = seed
         self._reset_iterator()
@@ -43,6 +43,7 @@ except ImportError:
 # +---------------------------------------------------------------------------+
 # | Related third party imports                                               |
 # +---------------------------------------------------------------------------+
+import numpy
 
 # +---------------------------------------------------------------------------+
 # | Local application imports                                                 |
@@ -53,39 +54,19 @@ from netzob.Fuzzing.Generators.xorshift import (
     native_xorshift8,
     native_xorshift16,
     native_xorshift32,
-    native_xorshift64
+    native_xorshift64,
+    native_xorshift_block
 )
 from netzob.Model.Vocabulary.Types.AbstractType import AbstractType
 
 
 ## Parameters taken from reference: "Xorshift RNGs" from George Marsaglia (https://www.jstatsoft.org/article/view/v008i14)
+## The state functions are compiled in the xorshift extension module
 
-def xorshift8(state):
-    state ^= (state << 7) & 0xff
-    state ^= (state >> 5) & 0xff
-    state ^= (state << 3) & 0xff
-    return state
-
-
-def xorshift16(state):
-    state ^= (state << 13) & 0xffff
-    state ^= (state >> 9) & 0xffff
-    state ^= (state << 7) & 0xffff
-    return state
-
-
-def xorshift32(state):
-    state ^= (state << 13) & 0xffffffff
-    state ^= (state >> 17) & 0xffffffff
-    state ^= (state << 5) & 0xffffffff
-    return state
-
-
-def xorshift64(state):
-    state ^= (state << 11) & 0xffffffffffffffff
-    state ^= (state >> 5) & 0xffffffffffffffff
-    state ^= (state << 32) & 0xffffffffffffffff
-    return state
+xorshift8 = native_xorshift8
+xorshift16 = native_xorshift16
+xorshift32 = native_xorshift32
+xorshift64 = native_xorshift64
 
 
 @NetzobLogger
@@ -125,10 +106,27 @@ class XorShiftGenerator(Generator):
     ...
     ValueError: negative values implies signed=True
 
+
+    # The seed is the initial state, so it must fit in the bitsize
+
+    >>> g = XorShiftGenerator(seed=256, minValue=1, maxValue=255)
+    Traceback (most recent call last):
+    ...
+    ValueError: The seed must be in [1, 255] for the generator XorShiftGenerator with a bitsize of 8, not: '256'
+
     """
 
+    __slots__ = ('_state', '_blockState', '_values', '_states', '_pos',
+                 '_minValue', '_maxValue', '_signed', '_bitsize',
+                 '_nbCall', '_nbCallMask', 'nb_values', 'nb_values_full',
+                 '_filterMin', '_filterMax',
+                 '_xorshift_func')
+
     name = "xorshift"
 
+    # Number of states produced at once when refilling the value buffer
+    BLOCK_SIZE = 4096
+
     def __init__(self,
                  seed=1,
                  minValue=None,
@@ -150,7 +148,7 @@ class XorShiftGenerator(Generator):
                 raise ValueError("negative values implies signed=True")
 
         # Initialize variables
-        self._state = seed
+        self.set_state(seed)
         self.minValue = minValue
         self.maxValue = maxValue
         self.signed = signed
@@ -160,6 +158,12 @@ class XorShiftGenerator(Generator):
         # Compute the number of uniq possible values
         self.nb_values = abs(self._maxValue - self._minValue) + 1
 
+        # Count the calls with a mask when nb_values is a power of two
+        if self.nb_values & (self.nb_values - 1) == 0:
+            self._nbCallMask = self.nb_values - 1
+        else:
+            self._nbCallMask = None
+
         # Handle bitsize
         bitsize = AbstractType.computeUnitSize(self.nb_values)  # Compute unit size according to the maximum length
         self.bitsize = bitsize.value
@@ -172,11 +176,25 @@ class XorShiftGenerator(Generator):
         if self.bitsize == 24:
             self.bitsize = 32
 
+        # Precompute the interval bounds clamped to the limits of the native
+        # integer types
+        if self.signed:
+            info = numpy.iinfo(numpy.int64)
+        else:
+            info = numpy.iinfo(numpy.uint64)
+        self._filterMin = max(self.minValue, int(info.min))
+        self._filterMax = min(self.maxValue, int(info.max))
+
         # Specific case for min == max
         if self.minValue == self.maxValue:
             self._xorshift_func = lambda x: self.maxValue
             return
 
+        # The seed is the initial state, which must fit in the bitsize
+        if not 0 < seed < (1 << self.bitsize):
+            raise ValueError("The seed must be in [1, {}] for the generator XorShiftGenerator with a bitsize of {}, not: '{}'"
+                             .format((1 << self.bitsize) - 1, self.bitsize, seed))
+
         # Select xorshift according to bitsize
         if self.bitsize == 8:
             self._xorshift_func = native_xorshift8
@@ -205,27 +223,62 @@ class XorShiftGenerator(Generator):
 
         """
 
-        self._state = self.seed
+        self.set_state(self.seed)
 
-        result = 0  # initial value (first call)
+        # Initial value (first call)
+        if self.minValue <= 0 <= self.maxValue:
+            yield 0
 
         while True:
-            # We respect the interval
-            if self.signed:
-                # Convert uint to int
-                result = result.to_bytes(self.bitsize // 8, byteorder='big', signed=False)
-                result = int.from_bytes(result, byteorder='big', signed=True)
+            if self._pos >= len(self._values):
+                self._refill()
+            pos = self._pos
+            self._pos = pos + 1
+            yield self._values[pos]
 
-            # If the value does not match the expected interval, we recursively call for the next value
-            if self.minValue <= result <= self.maxValue:
-                yield result
+    def _refill(self):
+        """Compute a new block of states and keep the ones whose values
+        respect the expected interval."""
 
-            result = self.xorshift()
+        self._pos = 0
+
+        # Specific case for min == max
+        if self.minValue == self.maxValue:
+            self._values = [self.maxValue]
+            self._states = [self.maxValue]
+            return
+
+        states = numpy.empty(self.BLOCK_SIZE, dtype=numpy.uint64)
+        if self.signed:
+            values = numpy.empty(self.BLOCK_SIZE, dtype=numpy.int64)
+        else:
+            values = None
+        while True:
+            # Only the states whose values match the expected interval are kept
+            count, self._blockState = native_xorshift_block(self._blockState,
+                                                            self.bitsize,
+                                                            self.signed,
+                                                            self._filterMin,
+                                                            self._filterMax,
+                                                            states,
+                                                            values)
+            if count > 0:
+                break
+
+        # The states are kept in the native buffer: they are only
+        # converted when requested by get_state()
+        self._states = states[:count]
+        if self.signed:
+            self._values = values[:count].tolist()
+        else:
+            self._values = self._states.tolist()
 
     def __next__(self):
-        nb_values = abs(self._maxValue - self._minValue) + 1
         value = super().__next__()
-        self._nbCall = (self._nbCall + 1) % nb_values
+        if self._nbCallMask is not None:
+            self._nbCall = (self._nbCall + 1) & self._nbCallMask
+        else:
+            self._nbCall = (self._nbCall + 1) % self.nb_values
         if self._nbCall == 0:
             # reset iterator after a full cycle to include 0 again
             self._reset_iterator()
@@ -242,6 +295,9 @@ class XorShiftGenerator(Generator):
         >>> val == gen.get_state()
         True
         """
+        if self._pos > 0:
+            # State of the last value taken from the current block
+            return int(self._states[self._pos - 1])
         return self._state
 
     def set_state(self, state):
@@ -256,9 +312,13 @@ class XorShiftGenerator(Generator):
         >>> gen.set_state(state)
         """
         self._state = state
+        self._blockState = state
+        self._values = []
+        self._states = []
+        self._pos = 0
 
     def xorshift(self):
-        self._state = self._xorshift_func(self._state)
+        self.set_state(self._xorshift_func(self.get_state()))
         return self._state
 
 
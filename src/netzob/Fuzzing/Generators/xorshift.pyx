@@ -1,30 +1,168 @@
 # xorshift.pyx
 
+cimport cython
+from libc.stdint cimport int8_t, int16_t, int32_t, int64_t
 from libc.stdint cimport uint8_t, uint16_t, uint32_t, uint64_t
 
-def native_xorshift8(uint8_t state):
-    state ^= (state << 7)
-    state ^= (state >> 5)
-    state ^= (state << 3)
+ctypedef fused state_t:
+    uint8_t
+    uint16_t
+    uint32_t
+    uint64_t
+
+
+cdef inline uint8_t _xorshift8(uint8_t state) nogil:
+    state ^= <uint8_t>(state << 7)
+    state ^= <uint8_t>(state >> 5)
+    state ^= <uint8_t>(state << 3)
     return state
 
 
-def native_xorshift16(uint16_t state):
-    state ^= (state << 13)
-    state ^= (state >> 9)
-    state ^= (state << 7)
+cdef inline uint16_t _xorshift16(uint16_t state) nogil:
+    state ^= <uint16_t>(state << 13)
+    state ^= <uint16_t>(state >> 9)
+    state ^= <uint16_t>(state << 7)
     return state
 
 
-def native_xorshift32(uint32_t state):
+cdef inline uint32_t _xorshift32(uint32_t state) nogil:
     state ^= (state << 13)
     state ^= (state >> 17)
     state ^= (state << 5)
     return state
 
 
-def native_xorshift64(uint64_t state):
+cdef inline uint64_t _xorshift64(uint64_t state) nogil:
     state ^= (state << 11)
     state ^= (state >> 5)
     state ^= (state << 32)
     return state
+
+
+def native_xorshift8(uint8_t state):
+    return _xorshift8(state)
+
+
+def native_xorshift16(uint16_t state):
+    return _xorshift16(state)
+
+
+def native_xorshift32(uint32_t state):
+    return _xorshift32(state)
+
+
+def native_xorshift64(uint64_t state):
+    return _xorshift64(state)
+
+
+cdef inline state_t _xorshift(state_t state) nogil:
+    if state_t is uint8_t:
+        return _xorshift8(state)
+    elif state_t is uint16_t:
+        return _xorshift16(state)
+    elif state_t is uint32_t:
+        return _xorshift32(state)
+    else:
+        return _xorshift64(state)
+
+
+cdef inline int64_t _signed(state_t state) nogil:
+    if state_t is uint8_t:
+        return <int8_t>state
+    elif state_t is uint16_t:
+        return <int16_t>state
+    elif state_t is uint32_t:
+        return <int32_t>state
+    else:
+        return <int64_t>state
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef Py_ssize_t _xorshift_block(state_t *state, bint signed, bint filtered,
+                                int64_t smin, int64_t smax,
+                                uint64_t umin, uint64_t umax,
+                                uint64_t[:] out, int64_t[:] values) nogil:
+    cdef Py_ssize_t i
+    cdef Py_ssize_t count = 0
+    cdef int64_t value
+    cdef state_t s = state[0]
+
+    # The width of the state is a compile-time constant in each
+    # specialization, so there is no dispatch inside the loops
+    if not filtered:
+        for i in range(out.shape[0]):
+            s = _xorshift(s)
+            out[i] = s
+            if signed:
+                values[i] = _signed(s)
+        state[0] = s
+        return out.shape[0]
+
+    for i in range(out.shape[0]):
+        s = _xorshift(s)
+        if signed:
+            value = _signed(s)
+            if smin <= value <= smax:
+                out[count] = s
+                values[count] = value
+                count += 1
+        elif umin <= s <= umax:
+            out[count] = s
+            count += 1
+    state[0] = s
+    return count
+
+
+def native_xorshift_block(uint64_t state, int bitsize, bint signed,
+                          minValue, maxValue, uint64_t[:] out,
+                          int64_t[:] values=None):
+    """Compute len(out) successive states following 'state', and store in
+    'out' the ones whose values (interpreted as signed integers of
+    'bitsize' bits if 'signed' is set) are in [minValue, maxValue]. When
+    'signed' is set, the corresponding signed values are stored in
+    'values', which must be as large as 'out'.
+
+    Return a tuple with the number of stored states and the last generated
+    state."""
+    cdef int64_t smin = 0, smax = 0
+    cdef uint64_t umin = 0, umax = 0
+    cdef uint8_t state8
+    cdef uint16_t state16
+    cdef uint32_t state32
+    cdef Py_ssize_t count
+    cdef bint filtered
+
+    if bitsize < 64 and state >> bitsize:
+        raise OverflowError("The state {} does not fit in {} bits".format(state, bitsize))
+    state8 = <uint8_t>state
+    state16 = <uint16_t>state
+    state32 = <uint32_t>state
+    if signed and (values is None or values.shape[0] < out.shape[0]):
+        raise ValueError("A values buffer as large as the states buffer is required for signed values")
+
+    # The filter is skipped when the interval covers all the values
+    # (the bounds are computed with Python integers, as 1 << 64 overflows)
+    size = <object>bitsize
+    if signed:
+        smin = minValue
+        smax = maxValue
+        filtered = minValue > -(1 << (size - 1)) or maxValue < (1 << (size - 1)) - 1
+    else:
+        umin = minValue
+        umax = maxValue
+        filtered = minValue > 0 or maxValue < (1 << size) - 1
+
+    with nogil:
+        if bitsize == 8:
+            count = _xorshift_block(&state8, signed, filtered, smin, smax, umin, umax, out, values)
+            state = state8
+        elif bitsize == 16:
+            count = _xorshift_block(&state16, signed, filtered, smin, smax, umin, umax, out, values)
+            state = state16
+        elif bitsize == 32:
+            count = _xorshift_block(&state32, signed, filtered, smin, smax, umin, umax, out, values)
+            state = state32
+        else:
+            count = _xorshift_block(&state, signed, filtered, smin, smax, umin, umax, out, values)
+    return count, state
@@ -35,6 +35,8 @@
 # +---------------------------------------------------------------------------+
 # | Standard library imports                                                  |
 # +---------------------------------------------------------------------------+
+from functools import partial
+import struct
 
 # +---------------------------------------------------------------------------+
 # | Related third party imports                                               |
@@ -304,6 +306,19 @@ class IntegerMutator(DomainMutator):
             if self._minLength < -(1 << (self.lengthBitSize.value - 1)):
                 raise ValueError("The lower bound {} is too small and cannot be encoded on {} bits".format(self._minLength, self.lengthBitSize.value))
 
+        # Precompile the packing of the generated values (24 bits integers
+        # need a specific truncation, handled by Integer.decode)
+        dom_type = self.domain.dataType
+        if self.lengthBitSize == UnitSize.SIZE_24:
+            self._decode = partial(Integer.decode,
+                                   unitSize=self.lengthBitSize,
+                                   endianness=dom_type.endianness,
+                                   sign=dom_type.sign)
+        else:
+            self._decode = struct.Struct(Integer.computeFormat(self.lengthBitSize,
+                                                               dom_type.endianness,
+                                                               dom_type.sign)).pack
+
         # Build the generator
         self.generator = GeneratorFactory.buildGenerator(self.generator,
                                                          seed=self.seed,
@@ -312,6 +327,16 @@ class IntegerMutator(DomainMutator):
                                                          bitsize=self.lengthBitSize.value,
                                                          signed=self.domain.dataType.sign == Sign.SIGNED)
 
+        # The determinist generator produces a small and finite set of
+        # values: encode them once
+        if isinstance(self.generator, DeterministGenerator):
+            try:
+                encodedValues = {value: self._decode(value) for value in self.generator._values}
+            except struct.error:
+                pass  # Errors are raised when generating the faulty values
+            else:
+                self._decode = encodedValues.__getitem__
+
     def copy(self):
         r"""Return a copy of the current mutator.
 
@@ -381,18 +406,7 @@ class IntegerMutator(DomainMutator):
         value = next(self.generator)
 
         if self.mode != FuzzingMode.FIXED:
-
-            # Handle redefined bitsize
-            dom_type = self.domain.dataType
-            if self.lengthBitSize is not None:
-                dst_bitsize = self.lengthBitSize
-            else:
-                dst_bitsize = dom_type.unitSize
-
-            value = Integer.decode(value,
-                                   unitSize=dst_bitsize,
-                                   endianness=dom_type.endianness,
-                                   sign=dom_type.sign)
+            value = self._decode(value)
         return value
 
 
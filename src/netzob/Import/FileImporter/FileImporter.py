@@ -141,9 +141,10 @@ class FileImporter(object):
         if file_content is None:
             raise Exception("No content found in '{}'".format(filePath))
 
-        for i_data, data in enumerate(file_content.split(delimitor)):
-            if len(data) > 0:
-                self.messages.add(FileMessage(data, file_path = filePath, file_message_number = i_data))
+        # Sort the messages of the file all at once
+        self.messages.addAll([FileMessage(data, file_path=filePath, file_message_number=i_data)
+                              for i_data, data in enumerate(file_content.split(delimitor))
+                              if len(data) > 0])
 
     @staticmethod
     @typeCheck(list, bytes)
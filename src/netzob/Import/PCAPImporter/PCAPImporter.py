@@ -217,7 +217,11 @@ class PCAPImporter(object):
             raise NetzobImportException("PCAP", errorMessage,
                                         self.INVALID_LAYER2)
         else:
+            # Collect the messages of the file, and sort them all at once
+            self.__newMessages = []
             packetReader.loop(nbPackets, self.__packetHandler)
+            self.messages.addAll(self.__newMessages)
+            self.__newMessages = None
 
     def __packetHandler(self, header, payload):
         """Internal callback executed on each packet when parsing the pcap"""
@@ -230,7 +234,7 @@ class PCAPImporter(object):
             # Build the RawMessage
             rawMessage = RawMessage(payload, epoch, source=None, destination=None)
 
-            self.messages.add(rawMessage)
+            self.__newMessages.append(rawMessage)
 
         elif self.importLayer == 2:
             try:
@@ -248,7 +252,7 @@ class PCAPImporter(object):
             l2Message = L2NetworkMessage(l2Payload, epoch, l2Proto, l2SrcAddr,
                                          l2DstAddr)
 
-            self.messages.add(l2Message)
+            self.__newMessages.append(l2Message)
 
         elif self.importLayer == 3:
             try:
@@ -269,7 +273,7 @@ class PCAPImporter(object):
             l3Message = L3NetworkMessage(l3Payload, epoch, l2Proto, l2SrcAddr,
                                          l2DstAddr, l3Proto, l3SrcAddr,
                                          l3DstAddr)
-            self.messages.add(l3Message)
+            self.__newMessages.append(l3Message)
 
         elif self.importLayer == 4:
             try:
@@ -292,7 +296,7 @@ class PCAPImporter(object):
                 l4Payload, epoch, l2Proto, l2SrcAddr, l2DstAddr, l3Proto,
                 l3SrcAddr, l3DstAddr, l4Proto, l4SrcPort, l4DstPort)
 
-            self.messages.add(l4Message)
+            self.__newMessages.append(l4Message)
 
         else:
             try:
@@ -314,7 +318,7 @@ class PCAPImporter(object):
                 l4Payload, epoch, l2Proto, l2SrcAddr, l2DstAddr, l3Proto,
                 l3SrcAddr, l3DstAddr, l4Proto, l4SrcPort, l4DstPort)
             
-            self.messages.add(l5Message)
+            self.__newMessages.append(l5Message)
 
     def __decodeLayer2(self, header, payload):
         """Internal method that parses the specified header and extracts
@@ -487,15 +491,21 @@ class PCAPImporter(object):
         
         # if requested, we merge consecutive messages that share same source and destination
         if mergePacketsInFlow:
-            mergedMessages = SortedTypedList(AbstractMessage)
+            mergedMessages = []
+            addMessage = mergedMessages.append
             previousMessage = None
+            previousSource = previousDestination = None
             for message in self.messages.values():
-                if previousMessage is not None and message.source == previousMessage.source and message.destination == previousMessage.destination:
+                source = message.source
+                destination = message.destination
+                if previousMessage is not None and source == previousSource and destination == previousDestination:
                     previousMessage.data += message.data
                 else:
-                    mergedMessages.add(message)
+                    addMessage(message)
                     previousMessage = message
-            self.messages = mergedMessages
+                    previousSource = source
+                    previousDestination = destination
+            self.messages = SortedTypedList(AbstractMessage, mergedMessages)
             
         return self.messages
 
@@ -63,6 +63,13 @@ class ChannelDownSymbol(Symbol):
     >>> u.name
     'ChannelDown Symbol'
 
+    All the channel down symbols are equal, and they hash alike:
+
+    >>> u == ChannelDownSymbol()
+    True
+    >>> len({u, ChannelDownSymbol()})
+    1
+
     """
 
     def __init__(self, message=None):
@@ -71,10 +78,11 @@ class ChannelDownSymbol(Symbol):
             fields=None, name="ChannelDown Symbol", messages=[self.message])
 
     def __eq__(self, other):
-        if other is None:
-            return False
         return isinstance(other, ChannelDownSymbol)
 
+    def __hash__(self):
+        return hash(ChannelDownSymbol)
+
     @property
     def message(self):
         """This message represents the message could not be sent as channel was down
@@ -144,8 +144,9 @@ class AbstractVariable(object):
     def __eq__(x, y):
         return x.__key() == y.__key()
 
-    def __hash__(self):
-        return self.__key()
+    # Hashing is identity based, as __key(): rely on the native object hash
+    # so that Memory and path dict lookups do not run Python code
+    __hash__ = object.__hash__
 
     def __str__(self):
         """The str method, mostly for debugging purpose."""
@@ -219,12 +219,13 @@ class AbstractRelationVariableLeaf(AbstractVariableLeaf):
         return []
 
     def compareValues(self, content, expectedSize, computedValue):
-        if content[:expectedSize].tobytes() == computedValue.tobytes():
-            msg = "The current variable data '{}' contain the expected value '{}'".format(content[:expectedSize].tobytes(), computedValue.tobytes())
+        prefix = content[:expectedSize]
+        if self._sameBytes(prefix, computedValue):
+            msg = "The current variable data '{}' contain the expected value '{}'".format(prefix.tobytes(), computedValue.tobytes())
             self._logger.debug(msg)
             return True
         else:
-            msg = "The current variable data '{}' does not contain the expected value '{}'".format(content[:expectedSize].tobytes(), computedValue.tobytes())
+            msg = "The current variable data '{}' does not contain the expected value '{}'".format(prefix.tobytes(), computedValue.tobytes())
             self._logger.debug(msg)
             return False
 
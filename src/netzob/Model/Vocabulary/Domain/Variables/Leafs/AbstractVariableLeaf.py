@@ -134,6 +134,29 @@ class AbstractVariableLeaf(AbstractVariable):
     def learn(self, parsingPath, acceptCallBack, carnivorous):
         raise NotImplementedError("method learn is not implemented")
 
+    @staticmethod
+    def _sameBytes(value, expectedValue):
+        """Return whether the two bitarrays hold the same bytes.
+
+        Bitarrays of the same size and bit order are compared directly,
+        which gives the same result without converting them to bytes. The
+        bit order matters: bitarray equality ignores it, tobytes() does not.
+
+        >>> from bitarray import bitarray
+        >>> from netzob.Model.Vocabulary.Domain.Variables.Leafs.AbstractVariableLeaf import AbstractVariableLeaf
+        >>> big = bitarray('01000000', endian='big')
+        >>> AbstractVariableLeaf._sameBytes(big, bitarray('01000000', endian='big'))
+        True
+        >>> AbstractVariableLeaf._sameBytes(big, bitarray('01000000', endian='little'))
+        False
+        >>> AbstractVariableLeaf._sameBytes(big, bitarray('00000010', endian='little'))
+        True
+
+        """
+        if len(value) == len(expectedValue) and value.endian() == expectedValue.endian():
+            return value == expectedValue
+        return value.tobytes() == expectedValue.tobytes()
+
     def getVariables(self):
         return [self]
 
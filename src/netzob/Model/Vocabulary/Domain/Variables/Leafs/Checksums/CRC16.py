@@ -38,12 +38,12 @@
 #+---------------------------------------------------------------------------+
 #| Related third party imports                                               |
 #+---------------------------------------------------------------------------+
-from PyCRC.CRC16 import CRC16 as _CRC16
 
 #+---------------------------------------------------------------------------+
 #| Local application imports                                                 |
 #+---------------------------------------------------------------------------+
 from netzob.Model.Vocabulary.Domain.Variables.Leafs.AbstractChecksum import AbstractChecksum
+from netzob.Model.Vocabulary.Domain.Variables.Leafs.Checksums.crc16 import native_crc16
 from netzob.Model.Vocabulary.Types.AbstractType import UnitSize
 
 
@@ -83,7 +83,7 @@ class CRC16(AbstractChecksum):
     """
 
     def calculate(self, msg):
-        return _CRC16().calculate(msg)
+        return native_crc16(msg)
 
     def getBitSize(self):
         return UnitSize.SIZE_16.value
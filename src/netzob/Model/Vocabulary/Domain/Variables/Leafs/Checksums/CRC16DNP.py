@@ -46,6 +46,9 @@ from PyCRC.CRC16DNP import CRC16DNP as _CRC16DNP
 from netzob.Model.Vocabulary.Domain.Variables.Leafs.Checksums.CRC16 import CRC16
 
 
+_IMPL = _CRC16DNP()
+
+
 class CRC16DNP(CRC16):
     r"""This class implements the CRC16DNP function.
 
@@ -62,4 +65,4 @@ class CRC16DNP(CRC16):
     """
 
     def calculate(self, msg):
-        return _CRC16DNP().calculate(msg)
+        return _IMPL.calculate(msg)
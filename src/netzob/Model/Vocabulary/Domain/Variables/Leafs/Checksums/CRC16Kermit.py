@@ -46,6 +46,9 @@ from PyCRC.CRC16Kermit import CRC16Kermit as _CRC16Kermit
 from netzob.Model.Vocabulary.Domain.Variables.Leafs.Checksums.CRC16 import CRC16
 
 
+_IMPL = _CRC16Kermit()
+
+
 class CRC16Kermit(CRC16):
     r"""This class implements the CRC16Kermit function.
 
@@ -62,4 +65,4 @@ class CRC16Kermit(CRC16):
     """
 
     def calculate(self, msg):
-        return _CRC16Kermit().calculate(msg)
+        return _IMPL.calculate(msg)
@@ -46,6 +46,9 @@ from PyCRC.CRC16SICK import CRC16SICK as _CRC16SICK
 from netzob.Model.Vocabulary.Domain.Variables.Leafs.Checksums.CRC16 import CRC16
 
 
+_IMPL = _CRC16SICK()
+
+
 class CRC16SICK(CRC16):
     r"""This class implements the CRC16SICK function.
 
@@ -62,4 +65,4 @@ class CRC16SICK(CRC16):
     """
 
     def calculate(self, msg):
-        return _CRC16SICK().calculate(msg)
+        return _IMPL.calculate(msg)
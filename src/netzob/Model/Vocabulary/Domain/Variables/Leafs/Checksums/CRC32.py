@@ -34,11 +34,11 @@
 #+---------------------------------------------------------------------------+
 #| Standard library imports                                                  |
 #+---------------------------------------------------------------------------+
+import zlib
 
 #+---------------------------------------------------------------------------+
 #| Related third party imports                                               |
 #+---------------------------------------------------------------------------+
-from PyCRC.CRC32 import CRC32 as _CRC32
 
 #+---------------------------------------------------------------------------+
 #| Local application imports                                                 |
@@ -69,7 +69,7 @@ class CRC32(AbstractChecksum):
     """
 
     def calculate(self, msg):
-        return _CRC32().calculate(msg)
+        return zlib.crc32(msg)
 
     def getBitSize(self):
         return UnitSize.SIZE_32.value
@@ -34,11 +34,11 @@
 #+---------------------------------------------------------------------------+
 #| Standard library imports                                                  |
 #+---------------------------------------------------------------------------+
+import binascii
 
 #+---------------------------------------------------------------------------+
 #| Related third party imports                                               |
 #+---------------------------------------------------------------------------+
-from PyCRC.CRCCCITT import CRCCCITT as _CRCCCITT
 
 #+---------------------------------------------------------------------------+
 #| Local application imports                                                 |
@@ -62,4 +62,5 @@ class CRCCCITT(CRC16):
     """
 
     def calculate(self, msg):
-        return _CRCCCITT().calculate(msg)
+        # CRC-CCITT (XModem): polynomial 0x1021 and initial value 0x0000
+        return binascii.crc_hqx(msg, 0x0000)
@@ -0,0 +1,52 @@
+# crc16.pyx
+
+cimport cython
+from libc.stdint cimport uint16_t
+
+# Slicing-by-8 tables of the CRC-16/ARC (reflected polynomial 0xA001)
+cdef uint16_t _table[8][256]
+
+
+cdef void _init_tables():
+    cdef int i, j, k
+    cdef uint16_t crc
+    for i in range(256):
+        crc = i
+        for j in range(8):
+            if crc & 0x0001:
+                crc = (crc >> 1) ^ 0xA001
+            else:
+                crc = crc >> 1
+        _table[0][i] = crc
+    for i in range(256):
+        crc = _table[0][i]
+        for k in range(1, 8):
+            crc = (crc >> 8) ^ _table[0][crc & 0xFF]
+            _table[k][i] = crc
+
+_init_tables()
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def native_crc16(const unsigned char[:] data):
+    cdef Py_ssize_t i = 0
+    cdef Py_ssize_t n = data.shape[0]
+    cdef uint16_t crc = 0x0000
+    with nogil:
+        # Fold 8 bytes per iteration
+        while i + 8 <= n:
+            crc = (_table[7][(crc ^ data[i]) & 0xFF] ^
+                   _table[6][((crc >> 8) ^ data[i + 1]) & 0xFF] ^
+                   _table[5][data[i + 2]] ^
+                   _table[4][data[i + 3]] ^
+                   _table[3][data[i + 4]] ^
+                   _table[2][data[i + 5]] ^
+                   _table[1][data[i + 6]] ^
+                   _table[0][data[i + 7]])
+            i += 8
+        # Process the remaining bytes one at a time
+        while i < n:
+            crc = (crc >> 8) ^ _table[0][(crc ^ data[i]) & 0xFF]
+            i += 1
+    return crc
@@ -34,6 +34,7 @@
 # +---------------------------------------------------------------------------+
 # | Standard library imports                                                  |
 # +---------------------------------------------------------------------------+
+import logging
 
 # +---------------------------------------------------------------------------+
 # | Related third party imports                                               |
@@ -47,6 +48,15 @@ from netzob.Common.Utils.Decorators import typeCheck, public_api, NetzobLogger
 from netzob.Model.Vocabulary.Domain.Variables.Leafs.AbstractVariableLeaf import AbstractVariableLeaf
 from netzob.Model.Vocabulary.Types.AbstractType import AbstractType
 from netzob.Model.Vocabulary.Types.BitArray import BitArray
+from netzob.Model.Vocabulary.Types.Raw import Raw
+
+
+# Shared empty values, per endianness, used for 'optional' data. They
+# must never be mutated.
+_EMPTY_CONTENT = {
+    'big': bitarray(endian='big'),
+    'little': bitarray(endian='little'),
+}
 
 
 @NetzobLogger
@@ -144,59 +154,103 @@ class Data(AbstractVariableLeaf):
         else:
             return False
 
-    def domainCMP(self, parsingPath, acceptCallBack=True, carnivorous=False, triggered=False):
-
-        if parsingPath is None:
-            raise Exception("ParsingPath cannot be None")
-
-        content = parsingPath.getData(self)
-        actualSize = len(content)
-
-        self._logger.debug("Learn '{}' with {} ({})".format(content.tobytes(),
-                                                            self.dataType, self.name))
+    def _computeSizeBounds(self):
+        """Returns the (minSize, maxSize) bounds, in bits, of the values
+        accepted by the data type. The upper bound is None when it
+        is not limited.
 
+        """
         try:
             minSize = maxSize = self.getFixedBitSize()
         except ValueError:
             (minSize, maxSize) = self.dataType.size
             if minSize is None:
                 minSize = 0
-            if maxSize is None:
-                maxSize = actualSize
+        return (minSize, maxSize)
+
+    def _parsingCandidates(self, content):
+        """Yields the prefixes of the content, from the longest to the
+        shortest, that can be parsed with the data type.
+
+        For a Raw type without constant value nor alphabet, any byte
+        aligned prefix within the size bounds is accepted, so the call to
+        canParse() is skipped and unaligned contents are rejected at once.
+
+        """
+        actualSize = len(content)
+
+        if self._sizeBounds is None:
+            self._sizeBounds = self._computeSizeBounds()
+        (minSize, maxSize) = self._sizeBounds
+        if maxSize is None:
+            maxSize = actualSize
 
         if actualSize < minSize:
             self._logger.debug(
-                "Length of the content is too short ({0}), expect data of at least {1} bits".
-                format(len(content), minSize))
+                "Length of the content is too short (%d), expect data of at least %d bits",
+                actualSize, minSize)
+            return
+
+        # Handle specific case where the parsing can be made at the bit level
+        if isinstance(self.dataType, BitArray):
+            step = -1
         else:
-            # Handle specific case where the parsing can be made at the bit level
-            if isinstance(self.dataType, BitArray):
-                step = -1
+            step = -8
+
+        dataType = self.dataType
+        anyRaw = isinstance(dataType, Raw) and dataType.value is None and dataType.alphabet is None
+
+        upperSize = min(maxSize, actualSize)
+
+        # Sizes are probed byte by byte, so they all share the alignment of
+        # upperSize: if it is not byte aligned, no Raw value can be parsed
+        if anyRaw and upperSize % 8 != 0:
+            return
+
+        for size in range(upperSize, minSize - 1, step):
+            self._logger.debug("Try to parse %d/%d bits for variable '%s'", size, upperSize, self.field)
+            # size == 0 : deals with 'optional' data
+            if size == 0:
+                yield _EMPTY_CONTENT[content.endian()]
+            elif anyRaw:
+                yield content[:size]
             else:
-                step = -8
-
-            for size in range(min(maxSize, len(content)), minSize - 1, step):
-                self._logger.debug("Try to parse {}/{} bits for variable '{}'".format(size, min(maxSize, len(content)), self.field))
-                # size == 0 : deals with 'optional' data
-                if size == 0 or self.dataType.canParse(content[:size]):
-                    # we create a new parsing path and returns it
-                    newParsingPath = parsingPath.copy()
-                    (addresult_succeed, addresult_parsingPaths) = newParsingPath.addResult(self, content[:size].copy())
-                    if addresult_succeed:
-                        for addresult_parsingPath in addresult_parsingPaths:
-                            yield addresult_parsingPath
-                    else:
-                        self._logger.debug("Parsed data does not respect a relation")
+                # the candidate slice is computed once and reused by canParse() and addResult()
+                candidate = content[:size]
+                if dataType.canParse(candidate):
+                    yield candidate
+
+    def domainCMP(self, parsingPath, acceptCallBack=True, carnivorous=False, triggered=False):
 
-    def valueCMP(self, parsingPath, acceptCallBack=True, carnivorous=False, triggered=False):
         if parsingPath is None:
             raise Exception("ParsingPath cannot be None")
 
-        expectedValue = self.dataType.value
+        content = parsingPath.getData(self)
+
+        if self._logger.isEnabledFor(logging.DEBUG):
+            self._logger.debug("Learn '{}' with {} ({})".format(content.tobytes(),
+                                                                self.dataType, self.name))
+
+        for candidate in self._parsingCandidates(content):
+            # we create a new parsing path and returns it
+            newParsingPath = parsingPath.copy()
+            (addresult_succeed, addresult_parsingPaths) = newParsingPath.addResult(self, candidate)
+            if addresult_succeed:
+                for addresult_parsingPath in addresult_parsingPaths:
+                    yield addresult_parsingPath
+            else:
+                self._logger.debug("Parsed data does not respect a relation")
+
+    def valueCMP(self, parsingPath, acceptCallBack=True, carnivorous=False, triggered=False):
+        if parsingPath is None:
+            raise Exception("ParsingPath cannot be None")
 
         # we check a value is available in memory
-        if parsingPath.memory is not None and parsingPath.memory.hasValue(self):
-            expectedValue = parsingPath.memory.getValue(self)
+        expectedValue = None
+        if parsingPath.memory is not None:
+            expectedValue = parsingPath.memory.getValueOrNone(self)
+        if expectedValue is None:
+            expectedValue = self.dataType.value
 
         if expectedValue is None:
             raise Exception(
@@ -207,15 +261,26 @@ class Data(AbstractVariableLeaf):
         if content is None:
             raise Exception("No data assigned to the variable")
 
-        self._logger.debug("ValueCMP {} with {} ({})".format(content.tobytes(), self.dataType, self.name))
+        # avoid converting the content to bytes for traces that are not emitted
+        debug = self._logger.isEnabledFor(logging.DEBUG)
+
+        expectedSize = len(expectedValue)
+        if len(content) < expectedSize:
+            if debug:
+                self._logger.debug("Data '{}' is too short to be parsed with variable {}".format(content.tobytes(), self))
+            return []
+
+        if debug:
+            self._logger.debug("ValueCMP {} with {} ({})".format(content.tobytes(), self.dataType, self.name))
 
         results = []
-        if len(content) >= len(expectedValue) and content[:len(
-                expectedValue)].tobytes() == expectedValue.tobytes():
-            (addresult_succeed, addresult_parsingPaths) = parsingPath.addResult(self, content[:len(expectedValue)].copy())
+        prefix = content[:expectedSize]
+        if self._sameBytes(prefix, expectedValue):
+            (addresult_succeed, addresult_parsingPaths) = parsingPath.addResult(self, prefix)
             results.extend(addresult_parsingPaths)
-            self._logger.debug("Data '{}' can be parsed with variable {}, providing '{}'".format(content.tobytes(), self, content[:len(expectedValue)].tobytes()))
-        else:
+            if debug:
+                self._logger.debug("Data '{}' can be parsed with variable {}, providing '{}'".format(content.tobytes(), self, prefix.tobytes()))
+        elif debug:
             self._logger.debug("Data '{}' cannot be parsed with variable {}".format(content.tobytes(), self))
         return results
 
@@ -225,45 +290,22 @@ class Data(AbstractVariableLeaf):
             raise Exception("ParsingPath cannot be None")
 
         content = parsingPath.getData(self)
-        actualSize = len(content)
-
-        self._logger.debug("Learn '{}' with {} ({})".format(content.tobytes(),
-                                                            self.dataType, self.name))
 
-        try:
-            minSize = maxSize = self.getFixedBitSize()
-        except ValueError:
-            (minSize, maxSize) = self.dataType.size
-            if minSize is None:
-                minSize = 0
-            if maxSize is None:
-                maxSize = actualSize
-
-        if actualSize < minSize:
-            self._logger.debug(
-                "Length of the content is too short ({0}), expect data of at least {1} bits".
-                format(len(content), minSize))
-        else:
-            # Handle specific case where the parsing can be made at the bit level
-            if isinstance(self.dataType, BitArray):
-                step = -1
+        if self._logger.isEnabledFor(logging.DEBUG):
+            self._logger.debug("Learn '{}' with {} ({})".format(content.tobytes(),
+                                                                self.dataType, self.name))
+
+        for candidate in self._parsingCandidates(content):
+            # we create a new parsing path and returns it
+            newParsingPath = parsingPath.copy()
+            (addresult_succeed, addresult_parsingPaths) = newParsingPath.addResult(self, candidate)
+            if addresult_succeed:
+                for addresult_parsingPath in addresult_parsingPaths:
+                    if addresult_parsingPath.memory is not None:
+                        addresult_parsingPath.memory.memorize(self, candidate.copy())
+                    yield addresult_parsingPath
             else:
-                step = -8
-
-            for size in range(min(maxSize, len(content)), minSize - 1, step):
-                self._logger.debug("Try to parse {}/{} bits for variable '{}'".format(size, min(maxSize, len(content)), self.field))
-                # size == 0 : deals with 'optional' data
-                if size == 0 or self.dataType.canParse(content[:size]):
-                    # we create a new parsing path and returns it
-                    newParsingPath = parsingPath.copy()
-                    (addresult_succeed, addresult_parsingPaths) = newParsingPath.addResult(self, content[:size].copy())
-                    if addresult_succeed:
-                        for addresult_parsingPath in addresult_parsingPaths:
-                            if addresult_parsingPath.memory is not None:
-                                addresult_parsingPath.memory.memorize(self, content[:size].copy())
-                            yield addresult_parsingPath
-                    else:
-                        self._logger.debug("Parsed data does not respect a relation")
+                self._logger.debug("Parsed data does not respect a relation")
 
     def use(self, variableSpecializerPath, acceptCallBack=True, preset=None, triggered=False):
         """This method participates in the specialization proces.
@@ -273,14 +315,20 @@ class Data(AbstractVariableLeaf):
 
         """
 
+        if variableSpecializerPath is None:
+            raise Exception("VariableSpecializerPath cannot be None")
+
         while True:
-            self._logger.debug("Use variable {} ({})".format(self.dataType, self.name))
+            self._logger.debug("Use variable %s (%s)", self.dataType, self.name)
 
-            if variableSpecializerPath is None:
-                raise Exception("VariableSpecializerPath cannot be None")
+            memory = variableSpecializerPath.memory
+            # an empty memory cannot hold a value for this variable
+            value = None
+            if memory is not None and len(memory.memory) > 0:
+                value = memory.getValueOrNone(self)
 
-            if variableSpecializerPath.memory is not None and variableSpecializerPath.memory.hasValue(self):
-                variableSpecializerPath.addResult(self, variableSpecializerPath.memory.getValue(self))
+            if value is not None:
+                variableSpecializerPath.addResult(self, value)
             elif self.dataType.value is not None:
                 variableSpecializerPath.addResult(self, self.dataType.value.copy())
             else:
@@ -296,15 +344,15 @@ class Data(AbstractVariableLeaf):
 
         """
 
-        while True:
-            self._logger.debug("Regenerate variable {} ({})".format(self.dataType, self.name))
+        if variableSpecializerPath is None:
+            raise Exception("VariableSpecializerPath cannot be None")
 
-            if variableSpecializerPath is None:
-                raise Exception("VariableSpecializerPath cannot be None")
+        while True:
+            self._logger.debug("Regenerate variable %s (%s)", self.dataType, self.name)
 
             newValue = self.dataType.generate()
 
-            self._logger.debug("Generated value for {}: {}".format(self, newValue))
+            self._logger.debug("Generated value for %s: %s", self, newValue)
 
             variableSpecializerPath.addResult(self, newValue)
 
@@ -318,22 +366,24 @@ class Data(AbstractVariableLeaf):
         It memorizes the value present in the path of the variable
         """
 
-        while True:
-            self._logger.debug("Regenerate and memorize variable '{}' ({}) for field '{}'".format(self.dataType, self.name, self.field))
+        if variableSpecializerPath is None:
+            raise Exception("VariableSpecializerPath cannot be None")
 
-            if variableSpecializerPath is None:
-                raise Exception("VariableSpecializerPath cannot be None")
+        while True:
+            self._logger.debug("Regenerate and memorize variable '%s' (%s) for field '%s'", self.dataType, self.name, self.field)
 
             variableSpecializerPath = variableSpecializerPath.copy()
 
-            if variableSpecializerPath.memory is not None and variableSpecializerPath.memory.hasValue(self):
-                newValue = variableSpecializerPath.memory.getValue(self)
-            else:
+            newValue = None
+            if variableSpecializerPath.memory is not None:
+                newValue = variableSpecializerPath.memory.getValueOrNone(self)
+            if newValue is None:
                 newValue = self.dataType.generate()
                 if variableSpecializerPath.memory is not None:
                     variableSpecializerPath.memory.memorize(self, newValue)
 
-            self._logger.debug("Generated value for {}: {}".format(self, newValue.tobytes()))
+            if self._logger.isEnabledFor(logging.DEBUG):
+                self._logger.debug("Generated value for {}: {}".format(self, newValue.tobytes()))
 
             variableSpecializerPath.addResult(self, newValue.copy())
 
@@ -354,3 +404,4 @@ class Data(AbstractVariableLeaf):
     @typeCheck(AbstractType)
     def dataType(self, dataType):
         self.__dataType = dataType
+        self._sizeBounds = None
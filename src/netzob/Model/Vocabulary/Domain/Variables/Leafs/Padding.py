@@ -290,14 +290,7 @@ class Padding(AbstractRelationVariableLeaf):
         if self.dataType.value is None:
             return self.compareLength(content, expectedSize, computedValue)
 
-        if content[:self._current_length_to_pad].tobytes() == computedValue.tobytes():
-            msg = "The current variable data '{}' contain the expected value '{}'".format(content[:self._current_length_to_pad].tobytes(), computedValue.tobytes())
-            self._logger.debug(msg)
-            return True
-        else:
-            msg = "The current variable data '{}' does not contain the expected value '{}'".format(content[:expectedSize].tobytes(), computedValue.tobytes())
-            self._logger.debug(msg)
-            return False
+        return super().compareValues(content, self._current_length_to_pad, computedValue)
 
     def __computeExpectedValue_stage1(self, targets, parsingPath, remainingVariables):
         """
@@ -176,7 +176,7 @@ class Memory(object):
         False
 
         """
-        return variable in list(self.memory.keys())
+        return variable in self.memory
 
     @public_api
     @typeCheck(AbstractVariable)
@@ -198,6 +198,29 @@ class Memory(object):
         """
         return self.memory[variable]
 
+    def getValueOrNone(self, variable):
+        """Returns the value memorized for the provided variable, or None if
+        the memory has no value for it. Memorized values are never None, so
+        this replaces a call to :meth:`hasValue` followed by a call to
+        :meth:`getValue` with a single lookup.
+
+        :param variable: The variable for which we want to retrieve the value in memory.
+        :type variable: :class:`Variable <netzob.Model.Vocabulary.Domaine.Variables.AbstractVariable.AbstractVariable>`, required
+        :return: The value in memory, or None.
+        :rtype: :class:`bitarray <bitarray>`
+
+        >>> from netzob.all import *
+        >>> variable = Data(String(), name="var1")
+        >>> memory = Memory()
+        >>> memory.getValueOrNone(variable) is None
+        True
+        >>> memory.memorize(variable, String("hello").value)
+        >>> memory.getValueOrNone(variable).tobytes()
+        b'hello'
+
+        """
+        return self.memory.get(variable)
+
     @public_api
     @typeCheck(str)
     def getVariable(self, name):
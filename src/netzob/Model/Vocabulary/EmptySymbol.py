@@ -53,6 +53,15 @@ class EmptySymbol(Symbol):
     EmptySymbol is only produced by the automaton, and thus should not
     be instantiated.
 
+    Unlike other symbols, all the empty symbols are equal, and they hash
+    alike:
+
+    >>> from netzob.all import *
+    >>> EmptySymbol() == EmptySymbol()
+    True
+    >>> len({EmptySymbol(), EmptySymbol()})
+    1
+
     """
 
     @public_api
@@ -61,14 +70,10 @@ class EmptySymbol(Symbol):
             fields=None, name="Empty Symbol", messages=[RawMessage()])
 
     def __eq__(self, other):
-        if other is None:
-            return False
         return isinstance(other, EmptySymbol)
 
     def __ne__(self, other):
-        if other is None:
-            return True
-        return not isinstance(other, EmptySymbol)
+        return not self.__eq__(other)
 
     def __repr__(self):
         return "Empty Symbol"
@@ -77,4 +82,4 @@ class EmptySymbol(Symbol):
         return "Empty Symbol"
 
     def __hash__(self):
-        return id(self)
+        return hash(EmptySymbol)
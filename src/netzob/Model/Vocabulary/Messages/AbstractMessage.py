@@ -28,6 +28,7 @@
 #+---------------------------------------------------------------------------+
 #| Standard library imports
 #+---------------------------------------------------------------------------+
+import os
 import uuid
 import time
 from collections import OrderedDict
@@ -50,6 +51,31 @@ from netzob.Model.Vocabulary.Functions.FunctionApplicationTable import FunctionA
 from netzob.Model.Vocabulary.Functions.VisualizationFunction import VisualizationFunction
 
 
+# Message identifiers are random (version 4) UUIDs, whose random bits are
+# read by batches of _UUID_BATCH_SIZE with a single os.urandom() call
+_UUID_BATCH_SIZE = 64
+_UUID_CLEAR_MASK = ~((0xc000 << 48) | (0xf000 << 64))  # variant and version
+_UUID_SET_MASK = (0x8000 << 48) | (4 << 76)            # RFC 4122, version 4
+_uuidPool = []
+
+
+def _uuid4():
+    """Return a random UUID, as :func:`uuid.uuid4` does."""
+    try:
+        value = _uuidPool.pop()
+    except IndexError:
+        random = os.urandom(16 * _UUID_BATCH_SIZE)
+        _uuidPool.extend(
+            int.from_bytes(random[i:i + 16], 'big') & _UUID_CLEAR_MASK | _UUID_SET_MASK
+            for i in range(16, len(random), 16))
+        value = int.from_bytes(random[:16], 'big') & _UUID_CLEAR_MASK | _UUID_SET_MASK
+    return uuid.UUID(int=value)
+
+
+# A forked process must not reuse the random bits of its parent
+os.register_at_fork(after_in_child=_uuidPool.clear)
+
+
 @NetzobLogger
 class AbstractMessage(SortableObject):
     """Every message must inherits from this class"""
@@ -83,7 +109,7 @@ class AbstractMessage(SortableObject):
         self.data = data
         self.session = session
         if _id is None:
-            _id = uuid.uuid4()
+            _id = _uuid4()
         self.id = _id
         if date is None:
             date = time.mktime(time.gmtime())
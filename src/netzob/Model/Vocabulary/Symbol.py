@@ -53,6 +53,7 @@ from netzob.Common.Utils.TypedList import TypedList
 from netzob.Model.Vocabulary.Messages.AbstractMessage import AbstractMessage
 from netzob.Model.Vocabulary.Field import Field
 from netzob.Model.Vocabulary.Domain.Variables.Memory import Memory
+from netzob.Model.Vocabulary.Domain.Specializer.MessageSpecializer import MessageSpecializer
 
 
 @NetzobLogger
@@ -91,6 +92,20 @@ class Symbol(AbstractField):
     :vartype description: :class:`str`
 
 
+    Symbols are mutable and often share the same name, so they are
+    compared and hashed by identity: two symbols with the same name, or a
+    symbol and its copy, are different symbols.
+
+    >>> from netzob.all import *
+    >>> s1 = Symbol(name="a")
+    >>> s1 == Symbol(name="a")
+    False
+    >>> s1 == s1.copy()
+    False
+    >>> s1 == s1
+    True
+
+
     **Usage of Symbol for protocol modeling**
 
     The Symbol class may be used to model a protocol from scratch, by
@@ -196,22 +211,17 @@ class Symbol(AbstractField):
     def __eq__(self, other):
         if not isinstance(other, Symbol):
             return False
-        if other is None:
-            return False
-        return self.name == other.name
+        return self.__key() == other.__key()
 
     def __ne__(self, other):
-        if other is None:
-            return True
-        if not isinstance(other, Symbol):
-            return True
-        return other.name != self.name
+        return not self.__eq__(other)
 
     def __key(self):
         return id(self)
 
-    def __hash__(self):
-        return id(self)
+    # Hashing is identity based, as __key(): rely on the native object hash
+    # so that dict lookups do not run Python code
+    __hash__ = object.__hash__
 
     @public_api
     def str_structure(self, preset=None, deepness=0):
@@ -317,7 +327,6 @@ class Symbol(AbstractField):
 
         """
 
-        from netzob.Model.Vocabulary.Domain.Specializer.MessageSpecializer import MessageSpecializer
         msg = MessageSpecializer(preset=preset, memory=memory)
 
         specializing_paths = msg.specializeSymbol(self)
@@ -384,8 +393,7 @@ class Symbol(AbstractField):
 
     def clearMessages(self):
         """Delete all the messages attached to the current symbol"""
-        while (len(self.__messages) > 0):
-            self.__messages.pop()
+        self.__messages.clear()
 
     # Properties
 
@@ -402,16 +410,17 @@ class Symbol(AbstractField):
         if messages is None:
             messages = []
 
+        messages = list(messages)
+
         # First it checks the specified messages are all AbstractMessages
-        for msg in messages:
-            if not isinstance(msg, AbstractMessage):
-                raise TypeError(
-                    "Cannot add messages of type {0} in the session, only AbstractMessages are allowed.".
-                    format(type(msg)))
+        if not all(isinstance(msg, AbstractMessage) for msg in messages):
+            msg = next(msg for msg in messages if not isinstance(msg, AbstractMessage))
+            raise TypeError(
+                "Cannot add messages of type {0} in the session, only AbstractMessages are allowed.".
+                format(type(msg)))
 
         self.clearMessages()
-        for msg in messages:
-            self.__messages.append(msg)
+        self.__messages._unsafeExtend(messages)
 
     def __repr__(self):
         return self.name
@@ -36,6 +36,10 @@
 # +---------------------------------------------------------------------------+
 from datetime import datetime, timedelta
 from enum import Enum
+from functools import lru_cache
+from math import gcd
+import struct
+import time
 from bitarray import bitarray
 
 # +---------------------------------------------------------------------------+
@@ -46,9 +50,7 @@ from bitarray import bitarray
 # | Local application imports                                                 |
 # +---------------------------------------------------------------------------+
 from netzob.Common.Utils.Decorators import NetzobLogger, public_api
-from netzob.Model.Vocabulary.Types.AbstractType import AbstractType, Sign, UnitSize
-from netzob.Model.Vocabulary.Types.TypeConverter import TypeConverter
-from netzob.Model.Vocabulary.Types.BitArray import BitArray
+from netzob.Model.Vocabulary.Types.AbstractType import AbstractType, Endianness, Sign, UnitSize
 from netzob.Model.Vocabulary.Types.Integer import Integer
 
 
@@ -69,6 +71,24 @@ class Epoch(Enum):
     COCOA = datetime(2001, 1, 1)
 
 
+_UNIX_EPOCH = datetime(1970, 1, 1)
+
+# Offset of each epoch from the Unix epoch, so that the current time and the
+# representable dates can be related to an epoch with integer operations
+_EPOCH_OFFSET_SEC = {
+    epoch: (epoch.value - _UNIX_EPOCH) // timedelta(seconds=1)
+    for epoch in Epoch
+}
+_EPOCH_OFFSET_NS = {
+    epoch: (epoch.value - _UNIX_EPOCH) // timedelta(microseconds=1) * 1000
+    for epoch in Epoch
+}
+
+# Range of Unix seconds of the dates a datetime can represent
+_MIN_UNIX = (datetime.min - _UNIX_EPOCH) // timedelta(seconds=1)
+_MAX_UNIX = (datetime.max - _UNIX_EPOCH) // timedelta(seconds=1)
+
+
 @public_api
 class Unity(Enum):
     __repr__ = Enum.__str__
@@ -80,6 +100,58 @@ class Unity(Enum):
     NANOSECOND = 10000000000
 
 
+# Ratio (numerator, denominator) converting a number of nanoseconds into
+# the unity, reduced so that no division is needed when unity >= nanosecond
+_UNITY_NUM_DEN = {
+    unity: (unity.value // gcd(unity.value, 1000000000),
+            1000000000 // gcd(unity.value, 1000000000))
+    for unity in Unity
+}
+
+# Range of values, per epoch and unity, of the timestamps whose date can be
+# represented (a value is floored to the second before being checked)
+_TICKS_RANGE = {
+    (epoch, unity): ((_MIN_UNIX - _EPOCH_OFFSET_SEC[epoch]) * unity.value,
+                     (_MAX_UNIX - _EPOCH_OFFSET_SEC[epoch] + 1) * unity.value - 1)
+    for epoch in Epoch
+    for unity in Unity
+}
+
+
+@lru_cache(maxsize=None)
+def _getStruct(unitSize, endianness, sign):
+    """Returns the compiled struct used to convert a timestamp between its
+    integer value and its raw representation."""
+    return struct.Struct(Integer.computeFormat(unitSize, endianness, sign))
+
+
+def _acceptsAllValues(unitSize, sign, epoch, unity):
+    """Returns True if every value storable on the unit size has a date that
+    can be represented from the epoch, in which case canParse does not need
+    to decode it."""
+    nbBits = int(unitSize.value)
+    if sign == Sign.SIGNED:
+        minValue, maxValue = -(1 << (nbBits - 1)), (1 << (nbBits - 1)) - 1
+    else:
+        minValue, maxValue = 0, (1 << nbBits) - 1
+    minTicks, maxTicks = _TICKS_RANGE[epoch, unity]
+    return minTicks <= minValue and maxValue <= maxTicks
+
+
+_ACCEPTS_ALL_VALUES = {
+    (unitSize, sign, epoch, unity): _acceptsAllValues(unitSize, sign, epoch, unity)
+    for unitSize in UnitSize
+    for sign in Sign
+    for epoch in Epoch
+    for unity in Unity
+}
+
+# Epochs and unities whose timestamps do not fit on 32 bits
+_SIZE_64_EPOCHS = [Epoch.WINDOWS, Epoch.MUMPS, Epoch.VMS]
+_SIZE_64_UNITIES = [Unity.DECISECOND, Unity.CENTISECOND, Unity.MILLISECOND, Unity.MICROSECOND, Unity.NANOSECOND]
+_VALID_UNITSIZES = [UnitSize.SIZE_32, UnitSize.SIZE_64]
+
+
 @NetzobLogger
 class Timestamp(AbstractType):
     r"""This class defines a Timestamp type.
@@ -260,40 +332,30 @@ class Timestamp(AbstractType):
             raise ValueError("A Timestamp should have either its constant value or its default value set, but not both")
 
         # Validate epoch
-        specific_epochs = [Epoch.WINDOWS, Epoch.MUMPS, Epoch.VMS]
-        if epoch in specific_epochs and unitSize == UnitSize.SIZE_32:
-            raise ValueError("A Timestamp epoch in the following list ({}) should have its unitSize set to UnitSize.SIZE_64".format(specific_epochs))
+        if epoch in _SIZE_64_EPOCHS and unitSize == UnitSize.SIZE_32:
+            raise ValueError("A Timestamp epoch in the following list ({}) should have its unitSize set to UnitSize.SIZE_64".format(_SIZE_64_EPOCHS))
 
         # Validate unity
-        specific_unities = [Unity.DECISECOND, Unity.CENTISECOND, Unity.MILLISECOND, Unity.MICROSECOND, Unity.NANOSECOND]
-        if unity in specific_unities and unitSize == UnitSize.SIZE_32:
-            raise ValueError("A Timestamp unity in the following list ({}) should have its unitSize set to UnitSize.SIZE_64".format(specific_unities))
+        if unity in _SIZE_64_UNITIES and unitSize == UnitSize.SIZE_32:
+            raise ValueError("A Timestamp unity in the following list ({}) should have its unitSize set to UnitSize.SIZE_64".format(_SIZE_64_UNITIES))
 
         # Validate uniSize
-        valid_unitSizes = [UnitSize.SIZE_32, UnitSize.SIZE_64]
-        if unitSize not in valid_unitSizes:
-            raise ValueError("unitSize parameter should be one of '{}', but not '{}'".format(valid_unitSizes, str(unitSize)))
+        if unitSize not in _VALID_UNITSIZES:
+            raise ValueError("unitSize parameter should be one of '{}', but not '{}'".format(_VALID_UNITSIZES, str(unitSize)))
 
         if value is not None and not isinstance(value, bitarray):
             # converts the specified value in bitarray
-            value = TypeConverter.convert(
-                value,
-                Integer,
-                BitArray,
-                src_unitSize=unitSize,
-                src_endianness=endianness,
-                src_sign=sign)
+            raw_value = _getStruct(unitSize, endianness, sign).pack(int(value))
+            value = bitarray()
+            value.frombytes(raw_value)
 
         if default is not None and not isinstance(default, bitarray):
             # converts the specified default value in bitarray
-            default = TypeConverter.convert(
-                default,
-                Integer,
-                BitArray,
-                src_unitSize=unitSize,
-                src_endianness=endianness,
-                src_sign=sign)
+            raw_default = _getStruct(unitSize, endianness, sign).pack(int(default))
+            default = bitarray()
+            default.frombytes(raw_default)
 
+        self._primedTicks = None
         self.epoch = epoch
         self.unity = unity
 
@@ -375,32 +437,25 @@ class Timestamp(AbstractType):
         if len(data) % 8 != 0:
             return False
 
-        if len(data) < int(self.unitSize.value):
+        unitSize = self.unitSize
+        nbBits = int(unitSize.value)
+        if len(data) < nbBits:
             return False
 
-        try:
-
-            value = TypeConverter.convert(
-                data[:int(self.unitSize.value)],
-                BitArray,
-                Integer,
-                dst_unitSize=self.unitSize,
-                dst_sign=self.sign)
-
-            # convert the value in seconds
-            value = value / self.unity.value
+        # no need to decode the value if all the values are accepted
+        if _ACCEPTS_ALL_VALUES[unitSize, self.sign, self.__epoch, self.__unity]:
+            return True
 
-            # add the utc now with the epoch
-            timestamp_datetime = self.epoch.value + timedelta(seconds=value)
+        # the length checks above guarantee exactly unitSize bits are
+        # decoded (the value has always been read in big endian here)
+        value = _getStruct(unitSize, Endianness.BIG, self.sign).unpack(
+            (data[:nbBits] if len(data) > nbBits else data).tobytes())[0]
 
-            # convert obtained datetime to timestamp in seconds
-            result_sec = int(timestamp_datetime.strftime('%s'))
-
-            datetime.fromtimestamp(result_sec)
-        except Exception:
-            return False
-
-        return True
+        # check the date of the value can be represented from the epoch
+        if self._ticksRange is None:
+            self._ticksRange = _TICKS_RANGE[self.__epoch, self.__unity]
+        minTicks, maxTicks = self._ticksRange
+        return minTicks <= value <= maxTicks
 
     def getMinStorageValue(self):
             return 0
@@ -431,29 +486,62 @@ class Timestamp(AbstractType):
         if self.default is not None:
             return self.default
 
-        # computes utc now
-        now = datetime.utcnow()
+        if self._primedTicks is not None:
+            result_unity = self._primedTicks
+        else:
+            result_unity = self._computeTicks(time.time_ns())
+
+        # convert to bitarray
+        final = bitarray()
+        final.frombytes(_getStruct(self.unitSize, self.endianness, self.sign).pack(result_unity))
+
+        return final
 
-        # substract the utc now with the epoch
-        timestamp_datetime = now - self.epoch.value
+    def _computeTicks(self, unixNs):
+        """Returns the number of unities elapsed between the epoch and the
+        provided number of nanoseconds since the Unix epoch."""
 
-        # convert obtained datetime to timestamp in seconds
-        result_sec = timestamp_datetime.total_seconds()
+        # work on an integer number of nanoseconds (a float number of
+        # seconds loses precision for small unities)
+        result_ns = unixNs - self._epochOffsetNs
 
         # apply the unity
-        result_unity = int(result_sec * self.unity.value)
+        if self._unityDen == 1:
+            return result_ns * self._unityNum
+        return result_ns * self._unityNum // self._unityDen
 
-        # convert to bitarray
-        final = TypeConverter.convert(
-            result_unity,
-            Integer,
-            BitArray,
-            src_unitSize=self.unitSize,
-            src_endianness=self.endianness,
-            src_sign=self.sign,
-            dst_endianness=self.endianness)
+    @public_api
+    def prime(self, now=None):
+        """Freezes the time used by :meth:`generate` to the provided UTC
+        datetime (or to the current time if None), so that a burst of
+        generations does not read and convert the clock for each value.
 
-        return final
+        >>> from netzob.all import *
+        >>> import datetime
+        >>> t = Timestamp()
+        >>> t.prime(datetime.datetime(2015, 10, 13, 11, 55, 33))
+        >>> t.generate().tobytes()
+        b'V\\x1c\\xf15'
+        >>> t.generate().tobytes()
+        b'V\\x1c\\xf15'
+        >>> t.invalidateClock()
+        >>> t.generate().tobytes() != b'V\\x1c\\xf15'
+        True
+
+        :param now: The UTC datetime to use, or None to read the current time.
+        :type now: :class:`datetime`, optional
+        """
+        if now is None:
+            unixNs = time.time_ns()
+        else:
+            unixNs = (now - _UNIX_EPOCH) // timedelta(microseconds=1) * 1000
+        self._primedTicks = self._computeTicks(unixNs)
+
+    @public_api
+    def invalidateClock(self):
+        """Releases the time frozen by :meth:`prime`: next calls to
+        :meth:`generate` read the current time again."""
+        self._primedTicks = None
 
     @staticmethod
     def decode(data,
@@ -479,17 +567,11 @@ class Timestamp(AbstractType):
                unitSize=UnitSize.SIZE_32,
                endianness=AbstractType.defaultEndianness(),
                sign=Sign.UNSIGNED):
-        from netzob.Model.Vocabulary.Types.Raw import Raw
+        byteorder = 'little' if endianness == Endianness.LITTLE else 'big'
+        intValue = int.from_bytes(data, byteorder, signed=(sign == Sign.SIGNED))
 
-        intValue = TypeConverter.convert(
-            data,
-            Raw,
-            Integer,
-            dst_unitSize=UnitSize.SIZE_32,
-            dst_sign=Sign.UNSIGNED)
-        parsedTimestamp = datetime.utcfromtimestamp(intValue)
-
-        return parsedTimestamp.strftime("%c")
+        # format the UTC struct_time directly, without building a datetime
+        return time.strftime("%c", time.gmtime(intValue))
 
     @property
     def epoch(self):
@@ -504,6 +586,13 @@ class Timestamp(AbstractType):
             raise TypeError("epoch value should a member of the Epoch enum")
         self.__epoch = epoch
 
+        # values derived from the epoch, used by canParse and generate
+        self._epochOffsetNs = _EPOCH_OFFSET_NS[epoch]
+        self._ticksRange = None
+
+        # a primed time is expressed from the previous epoch
+        self._primedTicks = None
+
     @property
     def unity(self):
         return self.__unity
@@ -516,6 +605,13 @@ class Timestamp(AbstractType):
             raise TypeError("unity value should a member of the Unity enum")
         self.__unity = unity
 
+        # values derived from the unity, used by canParse and generate
+        self._unityNum, self._unityDen = _UNITY_NUM_DEN[unity]
+        self._ticksRange = None
+
+        # a primed time is expressed in the previous unity
+        self._primedTicks = None
+
 
 def _test():
     r"""
@@ -37,7 +37,11 @@
 #+---------------------------------------------------------------------------+
 import abc
 import array
-import binascii
+import ctypes
+import ctypes.util
+import errno
+import os
+import selectors
 import shlex
 import socket
 import struct
@@ -50,11 +54,11 @@ try:
     from typing import Callable, List, Type  # noqa: F401
 except ImportError:
     pass
-from threading import Thread, Event
+from collections import deque
+from threading import Thread, Event, Lock, Condition, current_thread
 #from multiprocessing import Process, Event
-from queue import Queue, Empty
+from queue import Empty
 #from multiprocessing import Queue
-from getmac import get_mac_address
 
 #+---------------------------------------------------------------------------+
 #| Related third party imports                                               |
@@ -63,7 +67,7 @@ from getmac import get_mac_address
 #+---------------------------------------------------------------------------+
 #| Local application imports                                                 |
 #+---------------------------------------------------------------------------+
-from netzob.Common.Utils.Decorators import typeCheck, public_api, NetzobLogger
+from netzob.Common.Utils.Decorators import typeCheck, public_api, NetzobLogger, ttlCache
 from netzob.Simulator.ChannelBuilder import ChannelBuilder  # noqa: F401
 
 
@@ -71,6 +75,61 @@ class ChannelDownException(Exception):
     pass
 
 
+class OutputQueue(object):
+    """Queue of the packets written by the users of a channel and sent by
+    the channel thread.
+
+    It follows the :class:`queue.Queue` API used by the channel. The packets
+    are stored in a :class:`collections.deque`, whose append() and
+    popleft() are atomic, so that only the count of packets not yet sent,
+    used by :meth:`join`, is protected by a lock.
+
+    >>> from netzob.Simulator.AbstractChannel import OutputQueue
+    >>> queue = OutputQueue()
+    >>> queue.put(b'a')
+    >>> queue.put(b'b')
+    >>> queue.get_nowait(), queue.get_nowait()
+    (b'a', b'b')
+    >>> queue.get_nowait()
+    Traceback (most recent call last):
+    ...
+    _queue.Empty
+    >>> queue.task_done(2)
+    >>> queue.join()
+    """
+
+    def __init__(self):
+        self.__packets = deque()
+        self.__unfinished = 0
+        self.__allDone = Condition(Lock())
+
+    def put(self, data):
+        with self.__allDone:
+            self.__unfinished += 1
+        self.__packets.append(data)
+
+    def get_nowait(self):
+        try:
+            return self.__packets.popleft()
+        except IndexError:
+            raise Empty from None
+
+    def empty(self):
+        return len(self.__packets) == 0
+
+    def task_done(self, count=1):
+        with self.__allDone:
+            self.__unfinished -= count
+            if self.__unfinished <= 0:
+                self.__unfinished = 0
+                self.__allDone.notify_all()
+
+    def join(self):
+        with self.__allDone:
+            while self.__unfinished > 0:
+                self.__allDone.wait()
+
+
 @NetzobLogger
 class ChannelInterface(object, metaclass=abc.ABCMeta):
     """The ChannelInterface class specifies the methods to implement in
@@ -107,6 +166,7 @@ class ChannelInterface(object, metaclass=abc.ABCMeta):
 
     DEFAULT_WRITE_COUNTER_MAX = -1
     DEFAULT_TIMEOUT = None
+    SEND_BATCH_SIZE = 64  # max number of queued packets taken at once
 
     # Interface methods ##
 
@@ -267,10 +327,18 @@ class AbstractChannel(ChannelInterface, Thread, metaclass=abc.ABCMeta):
 
         if self.threaded_mode:
             self.queue_output.put(data)
+            self.wakeUp()
             self.queue_output.join()
             return len(data)
+        elif duration is None:
+            # Constant data sent once: no need to go through an iterator
+            self.__countWrite()
+            return self.writePacket(data)
         else:
-            return self.write_map(repeat(data), duration=duration)
+            # Constant data sent in a loop: hand it to the channel by batches
+            self.__countWrite()
+            return self.__writeDuring(repeat([data] * self.SEND_BATCH_SIZE),
+                                      self.writePacketBatch, duration)
 
     @public_api
     def write_map(self, data_iterator, duration=None):
@@ -288,12 +356,7 @@ class AbstractChannel(ChannelInterface, Thread, metaclass=abc.ABCMeta):
         :rtype: int
 
         """
-        if ((self.__writeCounterMax > 0) and
-           (self.__writeCounter > self.__writeCounterMax)):
-            raise Exception("Max write counter reached ({})"
-                            .format(self.__writeCounterMax))
-
-        self.__writeCounter += 1
+        self.__countWrite()
         len_data = 0
         if duration is None:
             try:
@@ -303,34 +366,81 @@ class AbstractChannel(ChannelInterface, Thread, metaclass=abc.ABCMeta):
             else:
                 len_data = self.writePacket(data)
         else:
-            rate_text = "unlimited"
-            if type(self._rate) is int and self._rate > 0:
-                rate_text = "{:.2f} kBps".format(self._rate / 1024)
+            len_data = self.__writeDuring(data_iterator, self.writePacket,
+                                          duration)
+        return len_data
 
-            t_initial = time.time()
-            t_start = t_initial
-            t_current = t_initial
-            for data in data_iterator:
+    def __writeDuring(self, items, write, duration):
+        """Write the successive items on the channel with the `write`
+        method (:meth:`writePacket` or :meth:`writePacketBatch`), until
+        `duration` seconds have elapsed, and return the amount of written
+        data, in bytes."""
+        rate_text = "unlimited"
+        if type(self._rate) is int and self._rate > 0:
+            rate_text = "{:.2f} kBps".format(self._rate / 1024)
+
+        # The rate itself is enforced by the interface (see set_rate()),
+        # so the clock is only read once per item to stop the loop.
+        # Times are integer nanoseconds.
+        len_data = 0
+        t_initial = time.monotonic_ns()
+        t_deadline = t_initial + int(duration * 1000000000)
+        t_next_log = t_initial + 1000000000
+        t_current = t_initial
+        for item in items:
 
-                if t_current > t_initial + duration:
-                    break
+            if t_current > t_deadline:
+                break
 
-                # Specialize the symbol and send it over the channel
+            # Send the packet, or the batch of packets, over the channel
+            len_data += write(item)
+            t_current = time.monotonic_ns()
+
+            # Show some log every seconds
+            if t_current >= t_next_log:
+                t_next_log = t_current - (t_current - t_initial) % 1000000000 + 1000000000
+                t_elapsed = (t_current - t_initial) / 1000000000
+                self._logger.debug(
+                    "Rate rule: {}, current rate: {:.2f} kBps, "
+                    "sent data: {:.2f} kB, nb seconds elapsed: "
+                    "{:.2f}".format(
+                        rate_text,
+                        len_data / t_elapsed / 1024,
+                        len_data / 1024,
+                        t_elapsed, 2))
+        return len_data
+
+    def __countWrite(self):
+        """Account for a new write call, and raise an exception if the
+        maximum number of writes has been reached."""
+        if ((self.__writeCounterMax > 0) and
+           (self.__writeCounter > self.__writeCounterMax)):
+            raise Exception("Max write counter reached ({})"
+                            .format(self.__writeCounterMax))
+
+        self.__writeCounter += 1
+
+    def writePacketBatch(self, datas):
+        """Write on the communication channel the specified packets, in
+        order.
+
+        This method may be superseded in child classes that can hand
+        several packets to the system at once. By default, each packet is
+        written with :meth:`writePacket`: a packet that cannot be written
+        because of a PermissionError is logged and the next ones are still
+        written.
+
+        :param datas: The packets to write on the channel.
+        :type datas: :class:`list` of :class:`bytes`
+        :return: The amount of written data, in bytes.
+        :rtype: :class:`int`
+        """
+        len_data = 0
+        for data in datas:
+            try:
                 len_data += self.writePacket(data)
-                t_current = time.time()
-
-                # Show some log every seconds
-                if t_current > t_start + 1:
-                    t_elapsed = t_current - t_initial
-                    t_start = t_current
-                    self._logger.debug(
-                        "Rate rule: {}, current rate: {:.2f} kBps, "
-                        "sent data: {:.2f} kB, nb seconds elapsed: "
-                        "{:.2f}".format(
-                            rate_text,
-                            len_data / t_elapsed / 1024,
-                            len_data / 1024,
-                            t_elapsed, 2))
+            except PermissionError as e:
+                self._logger.warning("Error on socket writing: '{}'".format(e))
         return len_data
 
     @public_api
@@ -378,7 +488,11 @@ class AbstractChannel(ChannelInterface, Thread, metaclass=abc.ABCMeta):
         # Threading management
         self.threaded_mode = False
         self.__stopEvent = Event()
-        self.__queue_output = Queue()
+        self.__queue_output = OutputQueue()
+        self.__wakeReader = None
+        self.__wakeWriter = None
+        # protects the wake pipe from being closed while wakeUp() writes
+        self.__wakeLock = Lock()
 
 
     ## Internal methods ##
@@ -415,6 +529,12 @@ class AbstractChannel(ChannelInterface, Thread, metaclass=abc.ABCMeta):
         if self._socket is not None:
             self._socket.settimeout(self.timeout)
 
+    def _channelDown(self):
+        """Raise a ChannelDownException, after forgetting the cached network
+        resolutions as the network configuration may have changed."""
+        NetUtils.clearCaches()
+        raise ChannelDownException()
+
     ## Thread management ##
 
     def run(self):
@@ -430,34 +550,114 @@ class AbstractChannel(ChannelInterface, Thread, metaclass=abc.ABCMeta):
             self._logger.error(e)
             return
 
-        while not self.__stopEvent.is_set():
-            self.process_data_to_send()
-
-            data = self.check_incoming_data()
+        # The thread sleeps until either data can be read or a packet has
+        # been queued (signaled through a pipe by wakeUp())
+        wakeReader, wakeWriter = os.pipe()
+        # a full pipe already wakes the thread: wakeUp() must not block
+        os.set_blocking(wakeWriter, False)
+        with self.__wakeLock:
+            self.__wakeReader, self.__wakeWriter = wakeReader, wakeWriter
+        selector = selectors.DefaultSelector()
+        selector.register(self.__wakeReader, selectors.EVENT_READ)
+        readableSocket = self.getReadableSocket()
+        if readableSocket is not None:
+            selector.register(readableSocket, selectors.EVENT_READ)
+
+        # bind the methods used for each packet once
+        isStopped = self.__stopEvent.is_set
+        process_data_to_send = self.process_data_to_send
+        check_incoming_data = self.check_incoming_data
+        process_incoming_data = self.process_incoming_data
+        select = selector.select
+        wakeReader = self.__wakeReader
 
-            if data is not None and len(data) > 0:
-                self.process_incoming_data(data)
+        try:
+            while not isStopped():
+                process_data_to_send()
+
+                if readableSocket is None:
+                    # read() cannot be waited on: poll it
+                    data = check_incoming_data()
+                    if data is not None and len(data) > 0:
+                        process_incoming_data(data)
+                    continue
+
+                # no timeout: stop() wakes the thread up through the pipe
+                try:
+                    events = select(None)
+                except (OSError, ValueError):
+                    if not self.isActive():
+                        break
+                    raise
+
+                for key, _ in events:
+                    if key.fileobj == wakeReader:
+                        os.read(wakeReader, 4096)
+                    else:
+                        data = check_incoming_data()
+                        if data is not None and len(data) > 0:
+                            process_incoming_data(data)
+        finally:
+            selector.close()
+            with self.__wakeLock:
+                wakeReader, wakeWriter = self.__wakeReader, self.__wakeWriter
+                self.__wakeReader = self.__wakeWriter = None
+                os.close(wakeReader)
+                os.close(wakeWriter)
         self._logger.debug("Exiting channel thread")
 
+    def getReadableSocket(self):
+        """Return the socket :meth:`read` receives its data from, so that the
+        channel thread can wait for it to be readable, or None if read() must
+        be polled.
+
+        This method should be superseded in child classes that do not read
+        from :attr:`_socket`.
+        """
+        return self._socket
+
+    def wakeUp(self):
+        """Wake the channel thread up, so that it processes its output queue
+        without waiting for incoming data."""
+        with self.__wakeLock:
+            wakeWriter = self.__wakeWriter
+            if wakeWriter is not None:
+                try:
+                    os.write(wakeWriter, b'\x00')
+                except OSError:
+                    pass
+
     def process_data_to_send(self):
-        while not self.queue_output.empty():  # Test if the queue is not empty
-            self._logger.debug("Process data to send")
+        queue_output = self.queue_output
+        get_nowait = queue_output.get_nowait
+        batchSize = self.SEND_BATCH_SIZE
+        debug = self._logger.debug
+        while True:
+            # Drain the queue by batches, without the racy empty()/get() pair
+            batch = []
+            append = batch.append
             try:
-                data = self.queue_output.get()
+                for _ in range(batchSize):
+                    append(get_nowait())
             except Empty:
-                self._logger.warning("Queue error")
-                raise
-            try:
-                self.writePacket(data)
-            except PermissionError as e:
-                self._logger.warning("Error on socket writing: '{}'".format(e))
-            self.queue_output.task_done()
-            self._logger.debug("Data sent")
+                pass
+
+            if len(batch) > 0:
+                debug("Process data to send")
+                try:
+                    self.writePacketBatch(batch)
+                except PermissionError as e:
+                    self._logger.warning("Error on socket writing: '{}'".format(e))
+                queue_output.task_done(len(batch))
+                debug("Data sent")
+
+            if len(batch) < batchSize:
+                break
 
     def check_incoming_data(self):
         try:
             data = self.read()
-            self._logger.debug("Received : {}".format(repr(data)))
+            self._logger.debug("Received : %r", data)
         except socket.timeout:
             data = None
         except Exception as e:
@@ -493,14 +693,16 @@ class AbstractChannel(ChannelInterface, Thread, metaclass=abc.ABCMeta):
         self.close()
 
         self.__stopEvent.set()
+        self.wakeUp()
 
     @public_api
     def wait(self):
         """Wait for the current thread to finish processing.
 
         """
-        while self.isActive():
-            time.sleep(0.5)
+        self.__stopEvent.wait()
+        if self.is_alive() and self is not current_thread():
+            self.join()
 
     @public_api
     def isActive(self):
@@ -566,6 +768,145 @@ class AbstractChannel(ChannelInterface, Thread, metaclass=abc.ABCMeta):
 
 # Utilitary methods ##
 
+# The local network interfaces are enumerated at most once every
+# _INTERFACES_CACHE_TTL seconds, unless the network configuration changed
+_INTERFACES_CACHE_TTL = 5.0
+_interfacesCache = {'time': None, 'generation': None, 'interfaces': None,
+                    'macs': None, 'addresses': None}
+_interfacesCacheLock = Lock()
+
+# Lifetime, in seconds, of the cached address resolutions. Remote MAC
+# addresses expire sooner, as ARP entries do.
+_REMOTE_MAC_CACHE_TTL = 10.0
+_LOCAL_ADDRESS_CACHE_TTL = 30.0
+
+# ARP table of the kernel, and how long to wait for an address to show up
+# in it once a resolution has been triggered, and when to trigger it again
+_PROC_NET_ARP = "/proc/net/arp"
+_ARP_PROBE_TIMEOUT = 1.0
+_ARP_PROBE_RETRY = 0.1
+
+# Mount point of sysfs, looked up once
+_sysroot = None
+
+# Socket on which the interface ioctl calls are issued, created once
+_ioctlSocket = None
+_ioctlSocketLock = Lock()
+
+# Netlink socket notified of the changes of the links, IPv4 addresses and
+# IPv4 routes (RTMGRP_LINK | RTMGRP_IPV4_IFADDR | RTMGRP_IPV4_ROUTE), and
+# number of times such changes were seen. The socket is False when netlink
+# is not available.
+_NETLINK_GROUPS = 0x01 | 0x10 | 0x40
+_netlinkSocket = None
+_netlinkSocketLock = Lock()
+_networkGeneration = 0
+
+
+def _getNetworkGeneration():
+    """Return a counter incremented each time the kernel notified a change
+    of the network configuration, which invalidates the cached local
+    address resolutions."""
+    global _netlinkSocket, _networkGeneration
+    # the notifications are drained and counted under the lock, so that no
+    # thread returns the previous generation while another one drains them
+    with _netlinkSocketLock:
+        if _netlinkSocket is None:
+            try:
+                s = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW,
+                                  socket.NETLINK_ROUTE)
+                s.setblocking(False)
+                s.bind((0, _NETLINK_GROUPS))
+            except (AttributeError, OSError):
+                s = False
+            _netlinkSocket = s
+        if _netlinkSocket is False:
+            return _networkGeneration
+
+        changed = False
+        while True:
+            try:
+                _netlinkSocket.recv(65536)
+            except BlockingIOError:
+                break
+            except OSError:  # e.g. ENOBUFS when notifications were lost
+                pass
+            changed = True
+        if changed:
+            _networkGeneration += 1
+        return _networkGeneration
+
+
+def _resetNetlinkSocket():
+    """Give a forked process its own netlink socket, as the notifications
+    of a shared one are only received by one of the processes. The
+    generation is incremented, as the notifications received by the parent
+    before the fork are not known."""
+    global _netlinkSocket, _netlinkSocketLock, _networkGeneration
+    _netlinkSocketLock = Lock()
+    if _netlinkSocket:
+        _netlinkSocket.close()
+    _netlinkSocket = None
+    _networkGeneration += 1
+
+
+os.register_at_fork(after_in_child=_resetNetlinkSocket)
+
+# Precompiled layouts of the structures exchanged with the ioctl calls
+_IFREQ_NAME = struct.Struct("16s16x")        # ifreq holding a name
+_IFREQ_HWADDR = struct.Struct("16xh6s8x")    # SIOCGIFHWADDR response
+_IFREQ_MTU = struct.Struct("16xH14x")        # SIOCGIFMTU response
+_IFREQ_SET_MTU = struct.Struct("16sH14x")    # SIOCSIFMTU request
+_IFREQ_ADDR = struct.Struct("256s")          # SIOCGIFADDR request
+_IFCONF = struct.Struct("iL")                # SIOCGIFCONF ifconf
+# ifreq records returned by SIOCGIFCONF: the name and a sockaddr_in, whose
+# address is at offset 20
+_IFCONF_IFREQ = struct.Struct("16s4x4s16x" if sys.maxsize > 2**32 else "16s4x4s8x")
+
+# Ethernet frame carrying an IPv4 ARP packet
+_ETH_P_ARP = 0x0806
+_ARP_FRAME = struct.Struct(">6s6sHHHBBH6s4s6s4s")
+
+# Classic BPF socket filters (see linux/filter.h): instructions, and the
+# sock_fprog structure given to SO_ATTACH_FILTER
+_SO_ATTACH_FILTER = getattr(socket, "SO_ATTACH_FILTER", 26)
+_SO_DETACH_FILTER = getattr(socket, "SO_DETACH_FILTER", 27)
+_BPF_INSN = struct.Struct("HBBI")
+_SOCK_FPROG = struct.Struct("HL")
+
+# Source and destination ports at the start of a TCP or UDP header
+_PORTS = struct.Struct(">HH")
+_PORTS_PROTOCOLS = (socket.IPPROTO_TCP, socket.IPPROTO_UDP)
+
+# Structures of sendmmsg(2). The function itself is loaded on first use
+# (False when the C library does not provide it).
+_SOCKADDR_IN = struct.Struct("=H2s4s8x")
+
+
+class _IOVec(ctypes.Structure):
+    _fields_ = [("iov_base", ctypes.c_void_p),
+                ("iov_len", ctypes.c_size_t)]
+
+
+class _MsgHdr(ctypes.Structure):
+    _fields_ = [("msg_name", ctypes.c_void_p),
+                ("msg_namelen", ctypes.c_uint32),
+                ("msg_iov", ctypes.POINTER(_IOVec)),
+                ("msg_iovlen", ctypes.c_size_t),
+                ("msg_control", ctypes.c_void_p),
+                ("msg_controllen", ctypes.c_size_t),
+                ("msg_flags", ctypes.c_int)]
+
+
+class _MMsgHdr(ctypes.Structure):
+    _fields_ = [("msg_hdr", _MsgHdr),
+                ("msg_len", ctypes.c_uint)]
+
+
+_sendmmsg = None
+
+
+@NetzobLogger
 class NetUtils(object):
     """A utilitary class that provides static methods to handle network
     address and interface resolutions.
@@ -573,6 +914,7 @@ class NetUtils(object):
     """
 
     @staticmethod
+    @ttlCache(_REMOTE_MAC_CACHE_TTL)
     def getRemoteMacAddress(remoteIP):
         r"""
         Retrieve remote MAC address from the remote IP address
@@ -587,25 +929,407 @@ class NetUtils(object):
 
 
         """
-        dstMacAddr = get_mac_address(ip=remoteIP)
-        if dstMacAddr is not None:
-            dstMacAddr = dstMacAddr.replace(':', '')
-            dstMacAddr = binascii.unhexlify(dstMacAddr)
+        if remoteIP.startswith("127."):
+            # The loopback interface has a null MAC address
+            dstMacAddr = b'\x00' * 6
         else:
-            # Force ARP resolution
-            p = subprocess.Popen(["/bin/ping", "-c1", "-W1", "-q", remoteIP])
-            p.wait()
-            time.sleep(0.1)
-
-            dstMacAddr = get_mac_address(ip=remoteIP)
-            if dstMacAddr is not None:
-                dstMacAddr = dstMacAddr.replace(':', '')
-                dstMacAddr = binascii.unhexlify(dstMacAddr)
-            else:
-                raise Exception("Cannot resolve IP address to a MAC address for IP: '{}'".format(remoteIP))
+            dstMacAddr = NetUtils._readArpTable(remoteIP)
+        if dstMacAddr is None:
+            # Ask the remote host directly
+            dstMacAddr = NetUtils._resolveWithArp(remoteIP)
+
+        if dstMacAddr is None:
+            # Force ARP resolution by the kernel with a UDP datagram to the
+            # discard port, sent again after _ARP_PROBE_RETRY seconds in case
+            # the first one was dropped, and watch the ARP table for at most
+            # _ARP_PROBE_TIMEOUT seconds
+            with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+                s.setblocking(False)
+                t_start = time.monotonic()
+                t_retry = t_start + _ARP_PROBE_RETRY
+                deadline = t_start + _ARP_PROBE_TIMEOUT
+                NetUtils._sendArpProbe(s, remoteIP)
+                while True:
+                    dstMacAddr = NetUtils._readArpTable(remoteIP)
+                    if dstMacAddr is not None:
+                        break
+                    now = time.monotonic()
+                    if now >= deadline:
+                        raise Exception("Cannot resolve IP address to a MAC address for IP: '{}'".format(remoteIP))
+                    if t_retry is not None and now >= t_retry:
+                        NetUtils._sendArpProbe(s, remoteIP)
+                        t_retry = None
+                    time.sleep(0.01)
         return dstMacAddr
 
     @staticmethod
+    def _sendArpProbe(sock, remoteIP):
+        """Send an empty UDP datagram to the discard port of the remote IP
+        address, so that the kernel resolves its MAC address."""
+        try:
+            sock.sendto(b'', (remoteIP, 9))
+        except OSError:
+            pass
+
+    @staticmethod
+    def _readArpTable(remoteIP):
+        """Return the MAC address associated to the remote IP address in the
+        ARP table of the kernel, or None if it is not resolved (yet).
+        """
+        try:
+            with open(_PROC_NET_ARP) as f:
+                next(f)  # skip the header line
+                for line in f:
+                    fields = line.split()
+                    # IP address, HW type, Flags, HW address, Mask, Device
+                    if fields[0] == remoteIP and fields[2] != "0x0":
+                        return bytes.fromhex(fields[3].replace(':', ''))
+        except (OSError, StopIteration, IndexError, ValueError):
+            pass
+        return None
+
+    @staticmethod
+    def _resolveWithArp(remoteIP, timeout=0.1):
+        """Resolve the MAC address of the remote IP address by broadcasting
+        an ARP request on the local interface used to reach it, and waiting
+        at most `timeout` seconds for the reply.
+
+        Return None if no reply was received, or if the request cannot be
+        sent (e.g. raw sockets are not permitted).
+        """
+        try:
+            localIP = NetUtils.getLocalIP(remoteIP)
+            interface = NetUtils.getLocalInterface(localIP)
+            if interface is None:
+                return None
+            localMac = NetUtils.getLocalMacAddress(interface)
+            s = socket.socket(socket.AF_PACKET, socket.SOCK_RAW,
+                              socket.htons(_ETH_P_ARP))
+        except Exception:
+            return None
+
+        remoteAddr = socket.inet_aton(remoteIP)
+        with s:
+            try:
+                s.bind((interface, _ETH_P_ARP))
+                s.send(_ARP_FRAME.pack(
+                    b'\xff' * 6, localMac, _ETH_P_ARP,
+                    1, 0x0800, 6, 4, 1,  # Ethernet/IPv4 request
+                    localMac, socket.inet_aton(localIP),
+                    b'\x00' * 6, remoteAddr))
+
+                deadline = time.monotonic() + timeout
+                while True:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return None
+                    s.settimeout(remaining)
+                    frame = s.recv(65535)
+                    if len(frame) < _ARP_FRAME.size:
+                        continue
+                    arp = _ARP_FRAME.unpack_from(frame)
+                    if arp[7] == 2 and arp[9] == remoteAddr:  # reply from remoteIP
+                        return arp[8]
+            except OSError:  # includes socket.timeout
+                return None
+
+    @staticmethod
+    def clearRemoteMacCache():
+        """
+        Forget the MAC addresses resolved by :meth:`getRemoteMacAddress`,
+        for instance after the ARP table of the host has changed.
+        """
+        NetUtils.getRemoteMacAddress.cache_clear()
+
+    @staticmethod
+    def clearCaches():
+        """
+        Forget all the cached address and interface resolutions, for
+        instance after the network configuration of the host has changed.
+        """
+        NetUtils.getRemoteMacAddress.cache_clear()
+        NetUtils.getLocalMacAddress.cache_clear()
+        NetUtils.getLocalInterface.cache_clear()
+        NetUtils.getLocalIP.cache_clear()
+        with _interfacesCacheLock:
+            _interfacesCache['time'] = None
+
+    @staticmethod
+    def getPortsParser(protocol):
+        r"""
+        Return the function that reads the source and destination ports at
+        the start of a header of the IP `protocol`, or None if `protocol` is
+        neither TCP nor UDP. The function takes the packet and an optional
+        offset of the header in it.
+
+        >>> import socket
+        >>> from netzob.Simulator.AbstractChannel import NetUtils
+        >>> parsePorts = NetUtils.getPortsParser(socket.IPPROTO_UDP)
+        >>> parsePorts(b'\x00\x35\x04\xd2'), parsePorts(b'\xff\x00\x35\x04\xd2', 1)
+        ((53, 1234), (53, 1234))
+        >>> NetUtils.getPortsParser(socket.IPPROTO_ICMP) is None
+        True
+
+        :param protocol: The IP protocol number.
+        :type protocol: :class:`int`
+        :rtype: ~typing.Callable[[bytes, int], ~typing.Tuple[int, int]]
+
+        """
+        if protocol in _PORTS_PROTOCOLS:
+            return _PORTS.unpack_from
+        return None
+
+    @staticmethod
+    def getRawSocketAddress(remoteIP):
+        """
+        Return the address to which a raw IPv4 socket sends the packets for
+        `remoteIP`, resolved once so that it is not on each send.
+
+        >>> from netzob.Simulator.AbstractChannel import NetUtils
+        >>> NetUtils.getRawSocketAddress("localhost")
+        ('127.0.0.1', 0)
+
+        :param remoteIP: The remote IP address or host name.
+        :type remoteIP: :class:`str`
+        :rtype: :class:`tuple`
+
+        """
+        return (socket.gethostbyname(remoteIP), 0)
+
+    @staticmethod
+    def attachPortsFilter(sock, srcPort, dstPort):
+        r"""
+        Attach a kernel filter to a raw IPv4 socket, so that it only receives
+        the TCP or UDP packets sent from `srcPort` to `dstPort`.
+
+        :param sock: The raw socket, whose received data start with the IP
+                     header.
+        :param srcPort: The expected source port.
+        :param dstPort: The expected destination port.
+        :type sock: :class:`socket.socket`
+        :type srcPort: :class:`int`
+        :type dstPort: :class:`int`
+        :return: Whether the filter could be attached.
+        :rtype: :class:`bool`
+
+        """
+        program = b''.join([
+            _BPF_INSN.pack(0xb1, 0, 0, 0),        # ldxb 4*([0]&0xf)
+            _BPF_INSN.pack(0x48, 0, 0, 0),        # ldh [x + 0]
+            _BPF_INSN.pack(0x15, 0, 3, srcPort),  # jeq #srcPort, next, drop
+            _BPF_INSN.pack(0x48, 0, 0, 2),        # ldh [x + 2]
+            _BPF_INSN.pack(0x15, 0, 1, dstPort),  # jeq #dstPort, next, drop
+            _BPF_INSN.pack(0x06, 0, 0, 0xffffffff),  # ret #-1 (accept)
+            _BPF_INSN.pack(0x06, 0, 0, 0),        # ret #0 (drop)
+        ])
+        buf = array.array('B', program)
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, _SO_ATTACH_FILTER,
+                            _SOCK_FPROG.pack(len(program) // _BPF_INSN.size,
+                                             buf.buffer_info()[0]))
+        except OSError:
+            return False
+        return True
+
+    @staticmethod
+    def sendPackets(sock, datas, remoteAddr, sendOne):
+        r"""
+        Send the packets to the remote IPv4 address through the raw or
+        datagram socket, with as few system calls as possible (see
+        sendmmsg(2)).
+
+        The packets that cannot be sent this way (e.g. sendmmsg() is not
+        available, or it failed) are sent one by one with `sendOne`. A
+        packet that cannot be sent because of a PermissionError is logged
+        and the next ones are still sent.
+
+        :param sock: The socket.
+        :param datas: The packets to send.
+        :param remoteAddr: The remote (IP address, port) pair. The port is
+                           0 for raw sockets.
+        :param sendOne: The function that sends one packet and returns the
+                        amount of sent data.
+        :type sock: :class:`socket.socket`
+        :type datas: :class:`list` of :class:`bytes`
+        :type remoteAddr: :class:`tuple`
+        :type sendOne: ~typing.Callable[[bytes], int]
+        :return: The amount of sent data, in bytes.
+        :rtype: :class:`int`
+
+        A single packet is sent with `sendOne`:
+
+        >>> import socket
+        >>> from netzob.Simulator.AbstractChannel import NetUtils
+        >>> server = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        >>> server.bind(("127.0.0.1", 0))
+        >>> server.settimeout(1)
+        >>> sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        >>> sentOne = []
+        >>> def sendOne(data):
+        ...     sentOne.append(data)
+        ...     return sock.sendto(data, server.getsockname())
+        >>> datas = [b"%03d" % i for i in range(3)]
+        >>> NetUtils.sendPackets(sock, datas, server.getsockname(), sendOne), sentOne
+        (9, [])
+        >>> [server.recv(16) for _ in range(3)]
+        [b'000', b'001', b'002']
+        >>> NetUtils.sendPackets(sock, datas[:1], server.getsockname(), sendOne), sentOne
+        (3, [b'000'])
+        >>> server.recv(16)
+        b'000'
+        >>> sock.close()
+        >>> server.close()
+
+        """
+        global _sendmmsg
+        if _sendmmsg is None:
+            _sendmmsg = False
+            try:
+                libc = ctypes.CDLL(ctypes.util.find_library("c"),
+                                   use_errno=True)
+                _sendmmsg = libc.sendmmsg
+                _sendmmsg.argtypes = [ctypes.c_int, ctypes.c_void_p,
+                                      ctypes.c_uint, ctypes.c_int]
+                _sendmmsg.restype = ctypes.c_int
+            except (OSError, AttributeError, TypeError):
+                pass
+
+        nb = len(datas)
+        sent = 0
+        len_data = 0
+        if _sendmmsg and nb > 1:
+            (remoteIP, remotePort) = remoteAddr
+            address = ctypes.create_string_buffer(_SOCKADDR_IN.pack(
+                socket.AF_INET, remotePort.to_bytes(2, 'big'),
+                socket.inet_aton(remoteIP)))
+            iovs = (_IOVec * nb)()
+            msgs = (_MMsgHdr * nb)()
+            for (i, data) in enumerate(datas):
+                iovs[i].iov_base = ctypes.cast(ctypes.c_char_p(data),
+                                               ctypes.c_void_p)
+                iovs[i].iov_len = len(data)
+                hdr = msgs[i].msg_hdr
+                hdr.msg_name = ctypes.addressof(address)
+                hdr.msg_namelen = _SOCKADDR_IN.size
+                hdr.msg_iov = ctypes.pointer(iovs[i])
+                hdr.msg_iovlen = 1
+
+            fd = sock.fileno()
+            msgsAddr = ctypes.addressof(msgs)
+            msgSize = ctypes.sizeof(_MMsgHdr)
+            while sent < nb:
+                res = _sendmmsg(fd, msgsAddr + sent * msgSize, nb - sent, 0)
+                if res <= 0:
+                    if ctypes.get_errno() == errno.ENOSYS:
+                        _sendmmsg = False
+                    break
+                sent += res
+            len_data = sum(msgs[i].msg_len for i in range(sent))
+
+        # Send the remaining packets one by one
+        for data in datas[sent:]:
+            try:
+                len_data += sendOne(data)
+            except PermissionError as e:
+                NetUtils._logger.warning("Error on socket writing: '{}'".format(e))
+        return len_data
+
+    @staticmethod
+    def detachFilter(sock):
+        """
+        Detach the kernel filter attached to the socket with
+        :meth:`attachPortsFilter`, if any.
+
+        :param sock: The socket.
+        :type sock: :class:`socket.socket`
+        """
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, _SO_DETACH_FILTER, 0)
+        except OSError:
+            pass
+
+    @staticmethod
+    def sendReceive(sock, data, write, read, parsePorts):
+        r"""
+        Write `data`, and return the first response read whose TCP or UDP
+        ports match the ones of `data`. When `parsePorts` is None, the
+        first response is returned.
+
+        While waiting for a response, a kernel filter drops the packets of
+        other connections (see :meth:`attachPortsFilter`). The timeout of
+        the socket bounds the whole exchange rather than each read.
+
+        >>> import socket
+        >>> from netzob.Simulator.AbstractChannel import NetUtils
+        >>> sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        >>> sock.bind(("127.0.0.1", 0))
+        >>> sock.settimeout(0.5)
+        >>> def write(data):
+        ...     return sock.sendto(data, sock.getsockname())
+        >>> def read():
+        ...     return sock.recv(64)
+        >>> NetUtils.sendReceive(sock, b"ping", write, read, None)
+        b'ping'
+        >>> def ignore(data):
+        ...     return 0
+        >>> try:
+        ...     NetUtils.sendReceive(sock, b"ping", ignore, read, None)
+        ... except socket.timeout:
+        ...     print("no response")
+        no response
+        >>> sock.gettimeout()
+        0.5
+        >>> sock.close()
+
+        :param sock: The socket the responses are read from.
+        :param data: The data to write, starting with the TCP or UDP header
+                     when `parsePorts` is set.
+        :param write: The function that writes `data`.
+        :param read: The function that returns the next response, starting
+                     with its TCP or UDP header when `parsePorts` is set.
+        :param parsePorts: The function that reads the source and
+                           destination ports, as returned by
+                           :meth:`getPortsParser`.
+        :type sock: :class:`socket.socket`
+        :type data: :class:`bytes`
+        :type write: ~typing.Callable[[bytes], int]
+        :type read: ~typing.Callable[[], bytes]
+        :type parsePorts: ~typing.Callable[[bytes], ~typing.Tuple[int, int]]
+        :return: The response.
+        :rtype: :class:`bytes`
+        :raise: :class:`socket.timeout` if no response matched in time
+
+        """
+        if parsePorts is not None:
+            (portSrcTx, portDstTx) = parsePorts(data)
+            # let the kernel drop the packets of other connections
+            NetUtils.attachPortsFilter(sock, portDstTx, portSrcTx)
+
+        timeout = sock.gettimeout()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        try:
+            write(data)
+            while True:
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise socket.timeout("timed out")
+                    sock.settimeout(remaining)
+                response = read()
+
+                if parsePorts is None:
+                    # Any response is the good one
+                    return response
+                (portSrcRx, portDstRx) = parsePorts(response)
+                if portSrcTx == portDstRx and portDstTx == portSrcRx:
+                    return response
+        finally:
+            sock.settimeout(timeout)
+            if parsePorts is not None:
+                NetUtils.detachFilter(sock)
+
+    @staticmethod
+    @ttlCache(_LOCAL_ADDRESS_CACHE_TTL, _getNetworkGeneration)
     def getLocalMacAddress(interface):
         r"""
         Retrieve local MAC address from the network interface.
@@ -619,13 +1343,22 @@ class NetUtils(object):
         Exception: Cannot retrieve local mac address from interface: 'eth42'
 
         """
+        # sysfs exposes the address without needing a socket
+        path = '{}/class/net/{}/address'.format(NetUtils._getSysroot(),
+                                                interface)
+        try:
+            with open(path) as fd:
+                address = bytes.fromhex(fd.read().strip().replace(':', ''))
+        except (OSError, ValueError):
+            pass
+        else:
+            # same 6 bytes as returned by the SIOCGIFHWADDR ioctl
+            return address[:6].ljust(6, b'\x00')
+
         def get_interface_addr(ifname):
-            s = socket.socket()
-            response = ioctl(s,
-                             0x8927,  # SIOCGIFADDR
-                             struct.pack("16s16x", ifname))
-            s.close()
-            return struct.unpack("16xh6s8x", response)
+            response = NetUtils._ioctl(0x8927,  # SIOCGIFHWADDR
+                                       _IFREQ_NAME.pack(ifname))
+            return _IFREQ_HWADDR.unpack(response)
 
         try:
             srcMacAddr = get_interface_addr(bytes(interface, 'utf-8'))[1]
@@ -658,17 +1391,22 @@ class NetUtils(object):
 
         """
 
+        # Look into the enumeration of the local interfaces first, and only
+        # query the interface if it did not show up there (yet)
+        for (networkInterface, ip) in NetUtils._getCachedInterfaces()[0]:
+            if networkInterface == ifname:
+                return ip
+
         try:
-            s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-            return socket.inet_ntoa(ioctl(
-                s.fileno(),
+            return socket.inet_ntoa(NetUtils._ioctl(
                 0x8915,  # SIOCGIFADDR
-                struct.pack('256s', bytes(ifname[:15], 'utf-8'))
+                _IFREQ_ADDR.pack(bytes(ifname[:15], 'utf-8'))
             )[20:24])
         except OSError as e:
             raise Exception("Cannot retrieve IP address from interface: '{}'".format(ifname)) from None
 
     @staticmethod
+    @ttlCache(_LOCAL_ADDRESS_CACHE_TTL, _getNetworkGeneration)
     def getLocalInterface(localIP):
         r"""
         Retrieve the network interface from the local IP address.
@@ -687,12 +1425,10 @@ class NetUtils(object):
 
         """
 
-        for (networkInterface, ip) in NetUtils.getLocalInterfaces():
-            if localIP == ip:
-                return networkInterface
-        return None
+        return NetUtils._getCachedInterfaces()[2].get(localIP)
 
     @staticmethod
+    @ttlCache(_LOCAL_ADDRESS_CACHE_TTL, _getNetworkGeneration)
     def getLocalIP(remoteIP):
         r"""Retrieve the source IP address which will be used to connect to the
         destination IP address.
@@ -725,31 +1461,63 @@ class NetUtils(object):
         True
 
         """
+        return list(NetUtils._getCachedInterfaces()[0])
+
+    @staticmethod
+    def _getCachedInterfaces():
+        """Return the (interfaces, MAC addresses, IP addresses) of the local
+        network interfaces, enumerating them again if the cached ones are too
+        old. The MAC and IP addresses are dicts mapping an address to the
+        first interface that has it.
+        """
+        with _interfacesCacheLock:
+            now = time.monotonic()
+            generation = _getNetworkGeneration()
+            if (_interfacesCache['time'] is None or
+                    _interfacesCache['generation'] != generation or
+                    now - _interfacesCache['time'] >= _INTERFACES_CACHE_TTL):
+                interfaces = NetUtils._enumerateLocalInterfaces()
+                macs = {}
+                addresses = {}
+                for (networkInterface, ip) in interfaces:
+                    addresses.setdefault(ip, networkInterface)
+                    try:
+                        mac = NetUtils.getLocalMacAddress(networkInterface)
+                    except Exception:
+                        continue
+                    macs.setdefault(mac, networkInterface)
+                _interfacesCache['interfaces'] = interfaces
+                _interfacesCache['macs'] = macs
+                _interfacesCache['addresses'] = addresses
+                _interfacesCache['time'] = now
+                _interfacesCache['generation'] = generation
+            return (_interfacesCache['interfaces'], _interfacesCache['macs'],
+                    _interfacesCache['addresses'])
+
+    @staticmethod
+    def _enumerateLocalInterfaces():
+        """Enumerate the (interface name, IP) tuples of the local network
+        interfaces through the SIOCGIFCONF ioctl."""
 
         # source : http://code.activestate.com/recipes/439093-get-names-of-all-up-network-interfaces-linux-only/
-        is_64bits = sys.maxsize > 2**32
-        struct_size = 40 if is_64bits else 32
-        s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        struct_size = _IFCONF_IFREQ.size
         max_possible = 8  # initial value
         while True:
             _bytes = max_possible * struct_size
-            names = array.array('B')
-            for i in range(0, _bytes):
-                names.append(0)
-            outbytes = struct.unpack('iL', ioctl(
-                s.fileno(),
+            names = array.array('B', bytes(_bytes))
+            outbytes = _IFCONF.unpack(NetUtils._ioctl(
                 0x8912,  # SIOCGIFCONF
-                struct.pack('iL', _bytes, names.buffer_info()[0])
+                _IFCONF.pack(_bytes, names.buffer_info()[0])
             ))[0]
             if outbytes == _bytes:
                 max_possible *= 2
             else:
                 break
-        namestr = names.tobytes()
+        # parse the records in place, without copying the buffer
         ifaces = []
-        for i in range(0, outbytes, struct_size):
-            iface_name = bytes.decode(namestr[i:i+16]).split('\0', 1)[0]
-            iface_addr = socket.inet_ntoa(namestr[i+20:i+24])
+        for (raw_name, raw_addr) in _IFCONF_IFREQ.iter_unpack(memoryview(names)[:outbytes]):
+            iface_name = bytes.decode(raw_name).split('\0', 1)[0]
+            iface_addr = socket.inet_ntoa(raw_addr)
             ifaces.append((iface_name, iface_addr))
 
         return ifaces
@@ -770,13 +1538,9 @@ class NetUtils(object):
 
         """
 
-        MacInBytes = localMac.replace(':', '')
-        MacInBytes = binascii.unhexlify(MacInBytes)
+        MacInBytes = bytes.fromhex(localMac.replace(':', ''))
 
-        for (networkInterface, _) in NetUtils.getLocalInterfaces():
-            if NetUtils.getLocalMacAddress(networkInterface) == MacInBytes:
-                return networkInterface
-        return None
+        return NetUtils._getCachedInterfaces()[1].get(MacInBytes)
 
     @staticmethod
     def getMtu(localInterface):
@@ -800,11 +1564,9 @@ class NetUtils(object):
 
         try:
             ifname = bytes(localInterface, 'utf-8')
-            s = socket.socket(type=socket.SOCK_DGRAM)
-            response = ioctl(s,
-                             0x8921,  # SIOCGIFMTU
-                             struct.pack("16s16x", ifname))
-            mtu = struct.unpack("16xH14x", response)[0]
+            response = NetUtils._ioctl(0x8921,  # SIOCGIFMTU
+                                       _IFREQ_NAME.pack(ifname))
+            mtu = _IFREQ_MTU.unpack(response)[0]
             return mtu
         except OSError as e:
             raise Exception("Cannot get MTU from interface: '{}'".format(localInterface)) from None
@@ -819,10 +1581,8 @@ class NetUtils(object):
         """
 
         ifname = bytes(localInterface, 'utf-8')
-        s = socket.socket(type=socket.SOCK_DGRAM)
-        ioctl(s,
-              0x8922,  # SIOCSIFMTU
-              struct.pack("16sH14x", ifname, mtu))
+        NetUtils._ioctl(0x8922,  # SIOCSIFMTU
+                        _IFREQ_SET_MTU.pack(ifname, mtu))
 
         # changing MTU set the interface down
         time.sleep(1.0)  # give some time to see the status change
@@ -847,18 +1607,33 @@ class NetUtils(object):
         True
 
         """
-        try:
-            with open('/proc/mounts', 'r') as f:
-                line = next(_ for _ in f.readlines() if 'sysfs' in _)
-        except StopIteration:
-            sysroot = '/sys'
-        else:
-            sysroot = line.split()[1]
-
-        path = '{}/class/net/{}/operstate'.format(sysroot, localInterface)
+        path = '{}/class/net/{}/operstate'.format(NetUtils._getSysroot(),
+                                                  localInterface)
         with open(path) as fd:
             return 'down' not in fd.read()
 
+    @staticmethod
+    def _ioctl(request, arg):
+        """Issue the ioctl on the datagram socket shared by the helpers of
+        this class, which is created on first use."""
+        global _ioctlSocket
+        if _ioctlSocket is None:
+            with _ioctlSocketLock:
+                if _ioctlSocket is None:
+                    _ioctlSocket = socket.socket(socket.AF_INET,
+                                                 socket.SOCK_DGRAM)
+        return ioctl(_ioctlSocket.fileno(), request, arg)
+
+    @staticmethod
+    def _getSysroot():
+        """Return the mount point of sysfs, looked up once."""
+        global _sysroot
+        if _sysroot is None:
+            with open('/proc/mounts', 'r') as f:
+                line = next((_ for _ in f if 'sysfs' in _), None)
+            _sysroot = '/sys' if line is None else line.split()[1]
+        return _sysroot
+
     @staticmethod
     def set_rate(localInterface, rate):
         r"""
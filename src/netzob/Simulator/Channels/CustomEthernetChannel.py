@@ -210,7 +210,7 @@ class CustomEthernetChannel(AbstractChannel):
         """
         if self._socket is not None:
 
-            rawRemoteMac = binascii.unhexlify(self.remoteMac.replace(':', ''))
+            rawRemoteMac = self.__rawRemoteMac
             self.write(data)
             while True:
                 (data, _) = self._socket.recvfrom(65535)
@@ -301,6 +301,8 @@ class CustomEthernetChannel(AbstractChannel):
         if remoteMac is None:
             raise TypeError("remoteMac cannot be None")
         self.__remoteMac = remoteMac
+        # binary form, matched against the received frames
+        self.__rawRemoteMac = binascii.unhexlify(remoteMac.replace(':', ''))
 
     @property
     def localMac(self):
@@ -62,7 +62,6 @@ from netzob.Model.Vocabulary.Domain.Variables.Leafs.Checksums.InternetChecksum i
 from netzob.Model.Vocabulary.Domain.Variables.Scope import Scope
 
 
-
 @NetzobLogger
 class CustomIPChannel(AbstractChannel):
     """A CustomIPChannel is a communication channel that is used to send IP
@@ -153,6 +152,10 @@ class CustomIPChannel(AbstractChannel):
         self._socket.settimeout(timeout or self.timeout)
         self._socket.setsockopt(socket.IPPROTO_IP, socket.IP_HDRINCL, 1)
         self._socket.bind((self.localIP, self.upperProtocol))
+        self.__recvBuffer = memoryview(bytearray(65535))
+        # responses are matched on their ports only for TCP and UDP
+        self.__parsePorts = NetUtils.getPortsParser(self.upperProtocol)
+        self.__remoteAddr = NetUtils.getRawSocketAddress(self.remoteIP)
         self.isOpen = True
 
     @public_api
@@ -178,8 +181,9 @@ class CustomIPChannel(AbstractChannel):
 
         """
         if self._socket is not None:
-            (data, _) = self._socket.recvfrom(65535)
-            return data
+            # Receive in the buffer of the channel, and only copy the packet
+            (size, _) = self._socket.recvfrom_into(self.__recvBuffer)
+            return self.__recvBuffer[:size].tobytes()
         else:
             raise Exception("socket is not available")
 
@@ -192,13 +196,30 @@ class CustomIPChannel(AbstractChannel):
 
         self.header_preset['ip.payload'] = data
         packet = next(self.header.specialize(self.header_preset))
+        return self._sendPacket(packet)
+
+    def writePacketBatch(self, datas):
+        """Write on the communication channel the specified packets, in
+        order, with as few system calls as possible.
 
+        :param datas: The packets to write on the channel.
+        :type datas: :class:`list` of :class:`bytes`
+        """
+        packets = []
+        for data in datas:
+            self.header_preset['ip.payload'] = data
+            packets.append(next(self.header.specialize(self.header_preset)))
+        return NetUtils.sendPackets(self._socket, packets, self.__remoteAddr,
+                                    self._sendPacket)
+
+    def _sendPacket(self, packet):
+        """Send the IP packet, whose header is already built."""
         try:
-            len_data = self._socket.sendto(packet, (self.remoteIP, 0))
+            len_data = self._socket.sendto(packet, self.__remoteAddr)
         except OSError as e:
             self._logger.warning("OSError durring socket.sendto(): '{}'. Trying a second time after sleeping 1s...".format(e))
             time.sleep(1)
-            len_data = self._socket.sendto(packet, (self.remoteIP, 0))
+            len_data = self._socket.sendto(packet, self.__remoteAddr)
         return len_data
 
     @public_api
@@ -210,32 +231,12 @@ class CustomIPChannel(AbstractChannel):
         :param data: the data to write on the channel
         :type data: :class:`bytes`
         """
-        if self._socket is not None:
-            # get the ports from message to identify the good response (in TCP or UDP)
-            portSrcTx = (data[0] * 256) + data[1]
-            portDstTx = (data[2] * 256) + data[3]
-
-            responseOk = False
-            stopWaitingResponse = False
-            self.write(data)
-            while stopWaitingResponse is False:
-                dataReceived = self._inner_read()
-
-                # IHL = (Bitwise AND 00001111) x 4bytes
-                ipHeaderLen = (dataReceived[0] & 15) * 4
-                portSrcRx = (dataReceived[ipHeaderLen] * 256) + \
-                    dataReceived[ipHeaderLen + 1]
-                portDstRx = (dataReceived[ipHeaderLen + 2] * 256) + \
-                    dataReceived[ipHeaderLen + 3]
-
-                stopWaitingResponse = (portSrcTx == portDstRx) and (portDstTx == portSrcRx)
-                if stopWaitingResponse:  # and not timeout
-                    responseOk = True
-            if responseOk:
-                return dataReceived[ipHeaderLen:]
-        else:
+        if self._socket is None:
             raise Exception("socket is not available")
 
+        return NetUtils.sendReceive(self._socket, data, self.write, self.read,
+                                    self.__parsePorts)
+
     def initHeader(self):
         """Initialize the IP header according to the IP format definition.
         """
@@ -330,6 +331,9 @@ class CustomIPChannel(AbstractChannel):
             raise TypeError("Listening IP cannot be None")
 
         self.__remoteIP = remoteIP
+        if self.isOpen:
+            # keep the destination resolved in open() up to date
+            self.__remoteAddr = NetUtils.getRawSocketAddress(remoteIP)
 
     @property
     def localIP(self):
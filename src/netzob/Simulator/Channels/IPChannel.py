@@ -137,6 +137,10 @@ class IPChannel(AbstractChannel):
         self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 2**30)
         self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 2**30)
         self._socket.bind((self.localIP, 0))
+        self.__recvBuffer = memoryview(bytearray(65535))
+        # responses are matched on their ports only for TCP and UDP
+        self.__parsePorts = NetUtils.getPortsParser(self.upperProtocol)
+        self.__remoteAddr = NetUtils.getRawSocketAddress(self.remoteIP)
         self.isOpen = True
 
     @public_api
@@ -151,12 +155,14 @@ class IPChannel(AbstractChannel):
         """Read the next message on the communication channel.
         """
         if self._socket is not None:
-            (data, _) = self._socket.recvfrom(65535)
+            # Receive in the buffer of the channel, and only copy the payload
+            (size, _) = self._socket.recvfrom_into(self.__recvBuffer)
+            data = self.__recvBuffer[:size]
             # Remove IP header from received data
             ipHeaderLen = (data[0] & 15) * 4  # (Bitwise AND 00001111) x 4bytes --> see RFC-791
-            if len(data) > ipHeaderLen:
+            if size > ipHeaderLen:
                 data = data[ipHeaderLen:]
-            return data
+            return data.tobytes()
         else:
             raise Exception("socket is not available")
 
@@ -170,13 +176,26 @@ class IPChannel(AbstractChannel):
             raise Exception("socket is not available")
 
         try:
-            len_data = self._socket.sendto(data, (self.remoteIP, 0))
+            len_data = self._socket.sendto(data, self.__remoteAddr)
         except OSError as e:
             self._logger.warning("OSError durring socket.sendto(): '{}'. Trying a second time after sleeping 1s...".format(e))
             time.sleep(1)
-            len_data = self._socket.sendto(data, (self.remoteIP, 0))
+            len_data = self._socket.sendto(data, self.__remoteAddr)
         return len_data
 
+    def writePacketBatch(self, datas):
+        """Write on the communication channel the specified packets, in
+        order, with as few system calls as possible.
+
+        :param datas: The packets to write on the channel.
+        :type datas: :class:`list` of :class:`bytes`
+        """
+        if self._socket is None:
+            raise Exception("socket is not available")
+
+        return NetUtils.sendPackets(self._socket, datas, self.__remoteAddr,
+                                    self.writePacket)
+
     @public_api
     def sendReceive(self, data):
         """Write on the communication channel the specified data and returns
@@ -189,32 +208,8 @@ class IPChannel(AbstractChannel):
         if self._socket is None:
             raise Exception("socket is not available")
 
-        usePorts = False
-        if self.upperProtocol == socket.IPPROTO_TCP or \
-           self.upperProtocol == socket.IPPROTO_UDP:
-            usePorts = True
-            # get the ports from message to identify the good response
-            #  (in TCP or UDP)
-
-            portSrcTx = (data[0] * 256) + data[1]
-            portDstTx = (data[2] * 256) + data[3]
-
-        self.write(data)
-        while True:
-            dataReceived = self.read()
-
-            if usePorts:
-                portSrcRx = (dataReceived[0] * 256) + dataReceived[1]
-                portDstRx = (dataReceived[2] * 256) + dataReceived[3]
-
-                if (portSrcTx == portDstRx) and \
-                   (portDstTx == portSrcRx):
-                    break
-            else:
-                # Any response is the good one
-                break
-
-        return dataReceived
+        return NetUtils.sendReceive(self._socket, data, self.write, self.read,
+                                    self.__parsePorts)
 
     # Management methods
 
@@ -235,6 +230,9 @@ class IPChannel(AbstractChannel):
             raise TypeError("Listening IP cannot be None")
 
         self.__remoteIP = remoteIP
+        if self.isOpen:
+            # keep the destination resolved in open() up to date
+            self.__remoteAddr = NetUtils.getRawSocketAddress(remoteIP)
 
     @property
     def localIP(self):
@@ -328,3 +326,37 @@ class IPChannelBuilder(ChannelBuilder):
 
     def set_protocol(self, value):
         self.attrs['upperProtocol'] = value
+
+
+def _test_ports_filter():
+    r"""
+
+    The kernel filter attached by sendReceive() only lets the datagram
+    sent from the expected port to the expected port reach the raw socket:
+
+    >>> import socket
+    >>> from netzob.Simulator.AbstractChannel import NetUtils
+    >>> def udpSocket():
+    ...     s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    ...     s.bind(("127.0.0.1", 0))
+    ...     return s
+    >>> server, other, client, wrong = (udpSocket() for _ in range(4))
+    >>> rx = socket.socket(socket.AF_INET, socket.SOCK_RAW, socket.IPPROTO_UDP)
+    >>> rx.settimeout(1)
+    >>> NetUtils.attachPortsFilter(rx, client.getsockname()[1], server.getsockname()[1])
+    True
+    >>> _ = wrong.sendto(b"wrong source", server.getsockname())
+    >>> _ = client.sendto(b"wrong destination", other.getsockname())
+    >>> _ = client.sendto(b"expected", server.getsockname())
+    >>> rx.recv(128)[28:]
+    b'expected'
+    >>> try:
+    ...     rx.recv(128)
+    ... except socket.timeout:
+    ...     print("nothing else received")
+    nothing else received
+    >>> NetUtils.detachFilter(rx)
+    >>> for s in (rx, server, other, client, wrong):
+    ...     s.close()
+
+    """
@@ -45,9 +45,7 @@ import ssl
 #| Local application imports                                                 |
 #+---------------------------------------------------------------------------+
 from netzob.Common.Utils.Decorators import typeCheck, NetzobLogger, public_api
-from netzob.Simulator.AbstractChannel import (AbstractChannel,
-                                              ChannelDownException,
-                                              NetUtils)
+from netzob.Simulator.AbstractChannel import AbstractChannel, NetUtils
 from netzob.Simulator.ChannelBuilder import ChannelBuilder
 
 
@@ -198,6 +196,10 @@ class SSLClient(AbstractChannel):
             self._socket.close()
         self.isOpen = False
 
+    def getReadableSocket(self):
+        """Return the socket read() receives its data from (the TLS socket)."""
+        return self.__ssl_socket
+
     @public_api
     def read(self):
         """Read the next message on the communication channel.
@@ -234,7 +236,7 @@ class SSLClient(AbstractChannel):
                 self.__ssl_socket.sendall(data)
                 return len(data)
             except ssl.SSLError:
-                raise ChannelDownException()
+                self._channelDown()
 
         else:
             raise Exception("socket is not available")
@@ -45,9 +45,7 @@ import socket
 #| Local application imports                                                 |
 #+---------------------------------------------------------------------------+
 from netzob.Common.Utils.Decorators import typeCheck, NetzobLogger, public_api
-from netzob.Simulator.AbstractChannel import (AbstractChannel,
-                                              ChannelDownException,
-                                              NetUtils)
+from netzob.Simulator.AbstractChannel import AbstractChannel, NetUtils
 from netzob.Simulator.ChannelBuilder import ChannelBuilder
 
 
@@ -213,11 +211,20 @@ class TCPClient(AbstractChannel):
                 self._socket.sendall(data)
                 return len(data)
             except socket.error:
-                raise ChannelDownException()
+                self._channelDown()
 
         else:
             raise Exception("socket is not available")
 
+    def writePacketBatch(self, datas):
+        """Write on the communication channel the specified packets, in a
+        single call as TCP is a stream
+
+        :parameter datas: the packets to write on the channel
+        :type datas: :class:`list` of :class:`bytes`
+        """
+        return self.writePacket(b"".join(datas))
+
     @public_api
     @typeCheck(bytes)
     def sendReceive(self, data):
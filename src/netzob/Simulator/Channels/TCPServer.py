@@ -166,6 +166,10 @@ class TCPServer(AbstractChannel):
         self.isOpen = False
         self._logger.debug("TCPServer has closed its socket")
 
+    def getReadableSocket(self):
+        """Return the socket read() receives its data from (the accepted client socket)."""
+        return self.__clientSocket
+
     @public_api
     def read(self):
         """Read the next message on the communication channel.
@@ -202,6 +206,15 @@ class TCPServer(AbstractChannel):
         else:
             raise Exception("socket is not available")
 
+    def writePacketBatch(self, datas):
+        """Write on the communication channel the specified packets, in a
+        single call as TCP is a stream
+
+        :parameter datas: the packets to write on the channel
+        :type datas: :class:`list` of :class:`bytes`
+        """
+        return self.writePacket(b"".join(datas))
+
     @public_api
     @typeCheck(bytes)
     def sendReceive(self, data):